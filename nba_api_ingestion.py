@@ -1,10 +1,47 @@
 import pandas as pd
+import asyncio
+import atexit
+import concurrent.futures
 import time
+import threading
+import functools
+import contextlib
+import random
 import psycopg2
+import sqlalchemy.exc
 from sqlalchemy import create_engine, text
 import os
-from bs4 import BeautifulSoup
+import io
+import argparse
+from dataclasses import dataclass, field
+import json
+import re
+import hashlib
+import email.utils
+from datetime import date, datetime
+import lxml.etree
+import lxml.html
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+    import pyarrow.feather as feather
+    import pyarrow.fs as pa_fs
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pa_ds = feather = pa_fs = pq = None
+
+try:
+    import aiohttp
+except ImportError:  # without it the async engine fetches through requests on worker threads
+    aiohttp = None
+
+try:
+    import asyncpg
+except ImportError:  # without it the async engine loads through psycopg2 on worker threads
+    asyncpg = None
 
 # Database Configuration
 DB_CONFIG = {
@@ -29,6 +66,487 @@ def validate_db_config():
         )
     return True
 
+# Scraper Configuration
+SCRAPER_CONFIG = {
+    'requests_per_second': float(os.getenv('SCRAPER_RPS', '1')),
+    'burst': int(os.getenv('SCRAPER_BURST', '1')),
+    'max_workers': int(os.getenv('SCRAPER_MAX_WORKERS', '4')),
+    'error_pause': float(os.getenv('SCRAPER_ERROR_PAUSE', '3')),
+    # Adaptive rate bounds (requests per second) and AIMD steps
+    'min_rps': float(os.getenv('SCRAPER_MIN_RPS', '0.1')),
+    # Defaults to the baseline rate: probing above it is opt-in
+    'max_rps': float(os.getenv('SCRAPER_MAX_RPS', os.getenv('SCRAPER_RPS', '1'))),
+    'rps_increase': float(os.getenv('SCRAPER_RPS_INCREASE', '0.02')),
+    'rps_decrease': float(os.getenv('SCRAPER_RPS_DECREASE', '0.5')),
+    # Responses slower than this count as the server struggling
+    'latency_target': float(os.getenv('SCRAPER_LATENCY_TARGET', '2')),
+    # Longest Retry-After the run waits out; a longer one stops fetching until it has passed
+    'max_retry_after': float(os.getenv('SCRAPER_MAX_RETRY_AFTER', '300')),
+    # Learned rate, carried over between runs
+    'rate_state_file': os.getenv('SCRAPER_RATE_STATE', os.path.join('.cache', 'rate_limit.json')),
+}
+
+class TokenBucket:
+    """Thread-safe token bucket that enforces one politeness budget across all workers."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Consume a token if one is available; otherwise return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Like acquire, but waits on the event loop instead of blocking the thread."""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold back every worker for `seconds` (e.g. after an error)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = max(self._updated, self._paused_until)
+
+class RetryAfterExceeded(RuntimeError):
+    """Raised instead of waiting when the server asked us to stay away longer than we are willing to wait."""
+
+    def __init__(self, seconds):
+        super().__init__(
+            f"server asked to wait {seconds:.0f}s (Retry-After), more than "
+            f"SCRAPER_MAX_RETRY_AFTER={SCRAPER_CONFIG['max_retry_after']:g}s; not fetching until then"
+        )
+        self.seconds = seconds
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket whose rate follows the server's feedback (AIMD).
+    
+    Every healthy response adds a small fixed step to the rate; a 429/5xx or
+    a response slower than the latency target multiplies it down. Retry-After
+    is honored in full by pausing every worker; while a pause longer than
+    `max_pause` is pending, acquiring raises RetryAfterExceeded instead of
+    waiting. The learned rate and any pending pause are saved to a state
+    file and picked up by the next run.
+    """
+
+    def __init__(self, rate, capacity=1, min_rate=0.1, max_rate=2.0, increase=0.02, decrease=0.5,
+                 latency_target=2.0, max_pause=None, state_file=None):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.max_pause = max_pause
+        self.state_file = state_file
+        self._last_decrease = 0.0
+        self._load_state()
+        self.rate = min(self.max_rate, max(self.min_rate, self.rate))
+
+    def _set_rate(self, rate):
+        # Settle the tokens earned at the old rate before switching
+        now = time.monotonic()
+        if now >= self._paused_until:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def record_success(self, latency):
+        """Additive increase after a healthy response; gentle decrease if it was slow."""
+        if latency > self.latency_target:
+            self._back_off(1 - (1 - self.decrease) / 2)
+            return
+        with self._lock:
+            self._set_rate(self.rate + self.increase)
+
+    def record_throttle(self, retry_after=None):
+        """Multiplicative decrease after a 429/5xx, pausing for the full Retry-After if given."""
+        self._back_off(self.decrease)
+        if retry_after is not None:
+            self.pause(retry_after)
+
+    def _reserve(self):
+        wait = super()._reserve()
+        if self.max_pause is not None and wait > self.max_pause:
+            raise RetryAfterExceeded(wait)
+        return wait
+
+    def _back_off(self, factor):
+        with self._lock:
+            now = time.monotonic()
+            # Responses already in flight report the same overload; cut once per round
+            if now - self._last_decrease < 1 / self.rate:
+                return
+            self._last_decrease = now
+            self._set_rate(self.rate * factor)
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+            # Clamped, in case the bounds were tightened since it was saved
+            self.rate = min(self.max_rate, max(self.min_rate, float(state['rate'])))
+            # A Retry-After still pending from an earlier run holds this one back too
+            pending = float(state.get('resume_at') or 0) - time.time()
+            if pending > 0:
+                self.pause(pending)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Ignoring rate limiter state {self.state_file}: {e}")
+
+    def save_state(self):
+        """Persist the learned rate, and any pending Retry-After pause, for the next run."""
+        if not self.state_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            state = {'rate': self.rate, 'updated_at': datetime.now().isoformat(timespec='seconds')}
+            pending = self._paused_until - time.monotonic()
+            if pending > 0:
+                state['resume_at'] = time.time() + pending
+            _atomic_write(self.state_file, json.dumps(state).encode())
+        except OSError as e:
+            print(f"⚠️  Could not save rate limiter state: {e}")
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+RATE_LIMITER = AdaptiveRateLimiter(
+    SCRAPER_CONFIG['requests_per_second'],
+    SCRAPER_CONFIG['burst'],
+    min_rate=SCRAPER_CONFIG['min_rps'],
+    max_rate=SCRAPER_CONFIG['max_rps'],
+    increase=SCRAPER_CONFIG['rps_increase'],
+    decrease=SCRAPER_CONFIG['rps_decrease'],
+    latency_target=SCRAPER_CONFIG['latency_target'],
+    max_pause=SCRAPER_CONFIG['max_retry_after'],
+    state_file=SCRAPER_CONFIG['rate_state_file'],
+)
+
+# HTTP Client Configuration
+HTTP_CONFIG = {
+    'base_url': 'https://www.basketball-reference.com',
+    'timeout': float(os.getenv('HTTP_TIMEOUT', '10')),
+    # Number of distinct hosts to keep pools for, and sockets kept per host
+    'pool_connections': int(os.getenv('HTTP_POOL_CONNECTIONS', '4')),
+    'pool_maxsize': int(os.getenv('HTTP_POOL_MAXSIZE', str(SCRAPER_CONFIG['max_workers']))),
+    # Block instead of opening extra sockets once a host's pool is exhausted
+    'pool_block': True,
+    'user_agent': os.getenv('HTTP_USER_AGENT', 'nba-ingestion-pipeline/1.0 (+python-requests)'),
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the shared keep-alive session used by every scraper in this module."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_CONFIG['pool_connections'],
+                    pool_maxsize=HTTP_CONFIG['pool_maxsize'],
+                    pool_block=HTTP_CONFIG['pool_block'],
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    'User-Agent': HTTP_CONFIG['user_agent'],
+                    'Accept': 'text/html,application/xhtml+xml',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive',
+                })
+                _http_session = session
+    return _http_session
+
+def close_http_session():
+    """Close the shared session and release its pooled connections."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+# Raw HTML Cache Configuration
+HTML_CACHE_CONFIG = {
+    'enabled': os.getenv('HTML_CACHE_ENABLED', '1') != '0',
+    'dir': os.getenv('HTML_CACHE_DIR', os.path.join('.cache', 'html')),
+    'max_bytes': int(os.getenv('HTML_CACHE_MAX_MB', '512')) * 1024 * 1024,
+}
+
+_html_cache_lock = threading.Lock()
+
+def current_season_end_year(today=None):
+    """Return the end year of the season in progress (seasons start in October)."""
+    today = today or date.today()
+    return today.year + 1 if today.month >= 10 else today.year
+
+def season_label(season_end_year):
+    """Format a season end year as stored in the season column (2024 -> '2023-24')."""
+    return f"{season_end_year-1}-{str(season_end_year)[-2:]}"
+
+def _cache_paths(url):
+    """Return (meta_path, blob_dir) for a URL; metadata is keyed by a hash of the URL."""
+    root = HTML_CACHE_CONFIG['dir']
+    url_key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(root, 'meta', f'{url_key}.json'), os.path.join(root, 'blobs')
+
+def _atomic_write(path, data):
+    """Write bytes to path via a temp file so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def cache_lookup(url):
+    """
+    Look up a cached response for a URL.
+    
+    Returns:
+        (metadata dict, body bytes), or (None, None) on a miss
+    """
+    if not HTML_CACHE_CONFIG['enabled']:
+        return None, None
+    meta_path, blob_dir = _cache_paths(url)
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        with open(os.path.join(blob_dir, f"{meta['sha256']}.html"), 'rb') as f:
+            body = f.read()
+        # Bump recency for LRU eviction
+        os.utime(meta_path)
+    except (OSError, ValueError, KeyError):
+        # Includes an entry evicted by another worker in the meantime
+        return None, None
+    return meta, body
+
+def cache_store(url, body, etag=None, last_modified=None, frozen=False):
+    """Store a response body (content-addressed by SHA-256) and its validators for a URL."""
+    if not HTML_CACHE_CONFIG['enabled']:
+        return
+    meta_path, blob_dir = _cache_paths(url)
+    digest = hashlib.sha256(body).hexdigest()
+    meta = {
+        'url': url,
+        'sha256': digest,
+        'size': len(body),
+        'etag': etag,
+        'last_modified': last_modified,
+        'frozen': frozen,
+        'fetched_at': time.time(),
+    }
+    with _html_cache_lock:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        os.makedirs(blob_dir, exist_ok=True)
+        blob_path = os.path.join(blob_dir, f'{digest}.html')
+        if not os.path.exists(blob_path):
+            _atomic_write(blob_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+        _evict_cache_locked()
+
+def _evict_cache_locked():
+    """
+    Drop least recently used entries until the cache fits in HTML_CACHE_CONFIG['max_bytes'].
+    
+    Blobs no metadata points at any more (older versions of a page that
+    changed) are removed first, so they never push live entries out.
+    """
+    root = HTML_CACHE_CONFIG['dir']
+    meta_dir = os.path.join(root, 'meta')
+    blob_dir = os.path.join(root, 'blobs')
+    entries = []
+    for name in os.listdir(meta_dir):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(meta_dir, name)
+        try:
+            with open(path, 'r') as f:
+                meta = json.load(f)
+            entries.append((os.path.getmtime(path), path, meta['sha256']))
+        except (OSError, ValueError, KeyError):
+            continue
+    
+    refs = {}
+    for _, _, digest in entries:
+        refs[digest] = refs.get(digest, 0) + 1
+    
+    blob_sizes = {}
+    for name in os.listdir(blob_dir):
+        if not name.endswith('.html'):
+            continue
+        digest = name[:-len('.html')]
+        blob_path = os.path.join(blob_dir, name)
+        if digest not in refs:
+            os.remove(blob_path)
+            continue
+        blob_sizes[digest] = os.path.getsize(blob_path)
+    total = sum(blob_sizes.values())
+    if total <= HTML_CACHE_CONFIG['max_bytes']:
+        return
+    
+    entries.sort()
+    for _, path, digest in entries:
+        if total <= HTML_CACHE_CONFIG['max_bytes']:
+            break
+        os.remove(path)
+        refs[digest] -= 1
+        # Blobs are shared between URLs with identical bodies
+        if refs[digest] == 0 and digest in blob_sizes:
+            os.remove(os.path.join(blob_dir, f'{digest}.html'))
+            total -= blob_sizes.pop(digest)
+
+def _revalidation_headers(meta):
+    """Conditional GET headers for a cached page (none if it is not cached)."""
+    headers = {}
+    if meta is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def _record_response(status, headers, started):
+    """Feed the server's pushback (or health) into the shared rate."""
+    if status == 429 or status >= 500:
+        RATE_LIMITER.record_throttle(parse_retry_after(headers.get('Retry-After')))
+    else:
+        RATE_LIMITER.record_success(time.monotonic() - started)
+
+def fetch_page(url, frozen=False):
+    """
+    GET a Basketball Reference page through the shared, rate-limited session.
+    
+    Cached pages marked frozen are served from disk without touching the
+    network; anything else is revalidated with a conditional GET
+    (If-None-Match / If-Modified-Since) and a 304 reuses the cached body.
+    
+    Args:
+        url: Absolute URL, or a path relative to HTTP_CONFIG['base_url']
+        frozen: Whether the page can no longer change (e.g. a finished season)
+    
+    Returns:
+        Raw response body as bytes
+    """
+    if url.startswith('/'):
+        url = HTTP_CONFIG['base_url'] + url
+    
+    meta, cached_body = cache_lookup(url)
+    # Only a copy fetched after the page froze is final; older copies are revalidated once
+    if meta is not None and meta.get('frozen'):
+        return cached_body
+    
+    RATE_LIMITER.acquire()
+    started = time.monotonic()
+    response = get_http_session().get(url, headers=_revalidation_headers(meta), timeout=HTTP_CONFIG['timeout'])
+    _record_response(response.status_code, response.headers, started)
+    
+    if response.status_code == 304 and meta is not None:
+        if frozen:
+            cache_store(url, cached_body, meta.get('etag'), meta.get('last_modified'), frozen=True)
+        return cached_body
+    
+    response.raise_for_status()
+    cache_store(
+        url,
+        response.content,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        frozen=frozen,
+    )
+    return response.content
+
+def new_async_http_session():
+    """Create an aiohttp session with the same pool limits, timeout and headers as the shared session."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=HTTP_CONFIG['pool_connections'] * HTTP_CONFIG['pool_maxsize'],
+            limit_per_host=HTTP_CONFIG['pool_maxsize'],
+        ),
+        timeout=aiohttp.ClientTimeout(total=HTTP_CONFIG['timeout']),
+        headers={
+            'User-Agent': HTTP_CONFIG['user_agent'],
+            'Accept': 'text/html,application/xhtml+xml',
+        },
+    )
+
+async def async_fetch_page(session, url, frozen=False):
+    """
+    Async counterpart of fetch_page on an aiohttp session.
+    
+    Shares the on-disk cache (read and written on a worker thread) and
+    RATE_LIMITER with the synchronous path.
+    
+    Args:
+        session: aiohttp.ClientSession (see new_async_http_session)
+        url: Absolute URL, or a path relative to HTTP_CONFIG['base_url']
+        frozen: Whether the page can no longer change (e.g. a finished season)
+    
+    Returns:
+        Raw response body as bytes
+    """
+    if url.startswith('/'):
+        url = HTTP_CONFIG['base_url'] + url
+    
+    meta, cached_body = await asyncio.to_thread(cache_lookup, url)
+    if meta is not None and meta.get('frozen'):
+        return cached_body
+    
+    await RATE_LIMITER.acquire_async()
+    started = time.monotonic()
+    async with session.get(url, headers=_revalidation_headers(meta)) as response:
+        body = await response.read()
+        _record_response(response.status, response.headers, started)
+        if response.status == 304 and meta is not None:
+            if frozen:
+                await asyncio.to_thread(cache_store, url, cached_body, meta.get('etag'),
+                                        meta.get('last_modified'), True)
+            return cached_body
+        response.raise_for_status()
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+    
+    await asyncio.to_thread(cache_store, url, body, etag, last_modified, frozen)
+    return body
+
 def create_database_if_not_exists():
     """Create the PostgreSQL database if it doesn't exist."""
     try:
@@ -74,138 +592,709 @@ def create_schema_if_not_exists(engine):
         print(f"❌ Error creating schema: {e}")
         return False
 
+# Connection Pool Configuration
+DB_POOL_CONFIG = {
+    # Persistent connections kept open, and extra ones allowed under load
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '5')),
+    # Check connections on checkout so a restarted server does not fail a run
+    'pool_pre_ping': True,
+    # Recycle connections older than this many seconds
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+}
+
+_db_engine = None
+_db_engine_lock = threading.Lock()
+_bootstrapped = {}
+_bootstrap_lock = threading.Lock()
+
 def get_db_connection():
-    """Establish connection to the PostgreSQL database."""
-    try:
-        create_database_if_not_exists()
+    """
+    Return the process-wide pooled engine, creating it on first use.
+    
+    The database and nba schema are checked (and created) only when the
+    engine is first built, so repeated runs in one process reuse both the
+    pooled connections and the bootstrap.
+    """
+    global _db_engine
+    if _db_engine is None:
+        with _db_engine_lock:
+            if _db_engine is None:
+                try:
+                    create_database_if_not_exists()
+                    
+                    connection_string = f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+                    engine = create_engine(connection_string, **DB_POOL_CONFIG)
+                    
+                    # Create schema
+                    if not create_schema_if_not_exists(engine):
+                        engine.dispose()
+                        return None
+                    
+                    _db_engine = engine
+                except Exception as e:
+                    print(f"❌ Error connecting to database: {e}")
+                    return None
+    return _db_engine
+
+def close_db_connection():
+    """Dispose of the shared engine's pool and forget which bootstrap steps ran."""
+    global _db_engine
+    with _db_engine_lock:
+        if _db_engine is not None:
+            _db_engine.dispose()
+            _db_engine = None
+    with _bootstrap_lock:
+        _bootstrapped.clear()
+
+def bootstrap_once(key, setup):
+    """
+    Run a bootstrap step (DDL, catalog lookups) at most once per process.
+    
+    Args:
+        key: Hashable identifying the step, e.g. ('table', 'player_season_totals')
+        setup: Zero-argument callable; a None or False result is not
+            remembered, so a failed step is retried on the next call
+    
+    Returns:
+        The step's result
+    """
+    with _bootstrap_lock:
+        if key in _bootstrapped:
+            return _bootstrapped[key]
+        result = setup()
+        if result is not None and result is not False:
+            _bootstrapped[key] = result
+        return result
+
+# data-stat keys used for the player cell (older and current page layouts)
+PLAYER_DATA_STATS = ('player', 'name_display')
+
+# Summary rows that share the player column but are not players
+SUMMARY_ROW_LABELS = ('League Average',)
+
+class RowAlignmentError(ValueError):
+    """Raised when a stats table has rows that cannot be tied to a player."""
+
+def _player_id_from_href(href):
+    """Extract player_id from a URL like /players/j/jamesle01.html."""
+    if not href:
+        return None
+    return href.rsplit('/', 1)[-1].replace('.html', '') or None
+
+def _read_table(table):
+    """
+    Read one <table> element into columnar lists in a single walk of its rows.
+    
+    Header labels, cell values (keyed by their data-stat attribute) and
+    player hrefs are read while walking the rows and appended straight into
+    per-column lists.
+    
+    Returns:
+        dict with 'stats' (data-stat keys in column order), 'headers'
+        (data-stat -> header label), 'columns' (data-stat -> list of values)
+        'player_ids' (one entry per extracted row, taken from that row's own
+        player cell) and 'row_issues' (list of (tbody row number, reason,
+        player label) for rows that are incomplete or have no player link)
+    """
+    # The last header row carries the column labels; earlier ones are group headers
+    header_rows = table.xpath('./thead/tr')
+    stats, headers = [], {}
+    if header_rows:
+        for cell in header_rows[-1].iterchildren('th', 'td'):
+            stat = cell.get('data-stat')
+            if stat and stat not in headers:
+                stats.append(stat)
+                headers[stat] = cell.text_content().strip() or stat
+    
+    columns = {stat: [] for stat in stats}
+    player_stat = next((stat for stat in stats if stat in PLAYER_DATA_STATS), None)
+    player_ids = []
+    row_issues = []
+    
+    for row_number, row in enumerate(table.xpath('./tbody/tr')):
+        # Skip the header rows repeated every 20 players
+        if 'thead' in (row.get('class') or '').split():
+            continue
         
-        connection_string = f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        engine = create_engine(connection_string)
+        values = {}
+        duplicates = []
+        player_id = None
+        for cell in row.iterchildren('th', 'td'):
+            stat = cell.get('data-stat')
+            if stat not in columns:
+                continue
+            if stat in values:
+                duplicates.append(stat)
+                continue
+            values[stat] = cell.text_content().strip() or None
+            if stat == player_stat:
+                links = cell.xpath('.//a[@href]')
+                if links:
+                    player_id = _player_id_from_href(links[0].get('href'))
         
-        # Create schema
-        create_schema_if_not_exists(engine)
+        if player_stat is not None:
+            label = values.get(player_stat)
+            if player_stat not in values:
+                # Without a player cell the row cannot be keyed at all
+                row_issues.append((row_number, 'missing player cell', None))
+                continue
+            if player_id is None:
+                if label in SUMMARY_ROW_LABELS:
+                    continue
+                row_issues.append((row_number, 'missing player link', label))
+            missing = [stat for stat in stats if stat not in values]
+            if missing:
+                row_issues.append((row_number, f"missing cells: {', '.join(missing)}", label))
+            if duplicates:
+                row_issues.append((row_number, f"duplicate cells: {', '.join(duplicates)}", label))
         
-        return engine
-    except Exception as e:
-        print(f"❌ Error connecting to database: {e}")
-        return None
+        # Values are keyed by data-stat, so a short row leaves gaps instead of shifting
+        for stat in stats:
+            columns[stat].append(values.get(stat))
+        player_ids.append(player_id)
+    
+    return {
+        'stats': stats,
+        'headers': headers,
+        'columns': columns,
+        'player_ids': player_ids,
+        'row_issues': row_issues,
+    }
+
+def extract_tables(content, table_ids=None):
+    """
+    Extract every requested table from one page with a single document parse.
+    
+    Basketball Reference ships many secondary tables (team and league
+    summaries, etc.) inside HTML comments that are uncommented client-side.
+    Those comments are picked up from the same parse tree, so only their own
+    text is parsed again, and only if a requested table was not found in
+    the live DOM.
+    
+    Args:
+        content: Raw page HTML (bytes or str)
+        table_ids: Iterable of table ids to extract, or None for every table
+            that has an id
+    
+    Returns:
+        dict of table id -> parsed table (see _read_table)
+    """
+    wanted = set(table_ids) if table_ids is not None else None
+    root = lxml.html.document_fromstring(content)
+    found = {}
+    
+    def collect(tree):
+        for table in tree.iter('table'):
+            table_id = table.get('id')
+            if table_id and table_id not in found and (wanted is None or table_id in wanted):
+                found[table_id] = _read_table(table)
+    
+    collect(root)
+    if wanted is None or not wanted.issubset(found):
+        for comment in root.iter(lxml.etree.Comment):
+            text = comment.text or ''
+            if '<table' not in text:
+                continue
+            collect(lxml.html.fragment_fromstring(text, create_parent='div'))
+            if wanted is not None and wanted.issubset(found):
+                break
+    return found
+
+def parse_stats_table(content, table_id):
+    """
+    Extract a single stats table from a page (live or commented).
+    
+    Args:
+        content: Raw page HTML (bytes or str)
+        table_id: id attribute of the table to extract (e.g. 'totals_stats'),
+            or a tuple of candidate ids tried in order
+    
+    Returns:
+        Parsed table (see _read_table), or None if the table is not on the page
+    """
+    candidates = (table_id,) if isinstance(table_id, str) else tuple(table_id)
+    tables = extract_tables(content, candidates)
+    for candidate in candidates:
+        if candidate in tables:
+            return tables[candidate]
+    return None
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """One column of a season table: SQL name and type, pandas dtype and source headers."""
+    name: str
+    sql_type: str
+    # Declared pandas dtype ('Int32', 'float32', 'category'); None keeps the parsed value
+    dtype: str = None
+    # Scraped header labels (or data-stat keys) that land in this column
+    aliases: tuple = ()
+    nullable: bool = True
+
+@dataclass(frozen=True)
+class TableSchema:
+    """
+    Declarative definition of one stat type's table.
+    
+    DDL, header -> column mapping, dtype coercion, COPY column order and the
+    upsert key are all derived from this, so they cannot drift apart.
+    """
+    stat_type: str
+    table_name: str
+    columns: tuple
+    # (index name suffix, columns) for the secondary indexes
+    indexes: tuple = ()
+    natural_key: tuple = ('player_id', 'season', 'team')
+    # Index names of the default table are '{index_prefix}{suffix}'; otherwise 'idx_{table}_{suffix}'
+    index_prefix: str = None
+    # Candidate ids of the stats table on the page; defaults to ('{stat_type}_stats',)
+    table_ids: tuple = ()
+    # End year of the first season Basketball Reference has this page for
+    first_season: int = 1950
+    _by_alias: dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        by_alias = {}
+        for spec in self.columns:
+            by_alias[spec.name] = spec
+            for alias in spec.aliases:
+                by_alias[alias] = spec
+        object.__setattr__(self, '_by_alias', by_alias)
+    
+    @property
+    def column_names(self):
+        return tuple(spec.name for spec in self.columns)
+    
+    def split_columns(self, df):
+        """
+        Split a DataFrame's columns against the table.
+        
+        Returns:
+            (table columns present in df, in table order; df columns with no table column)
+        """
+        table_columns = self.column_names
+        columns = [col for col in table_columns if col in df.columns]
+        skipped = [col for col in df.columns if col not in table_columns]
+        return columns, skipped
+    
+    def resolve(self, label):
+        """Return the ColumnSpec for a header label, data-stat key or column name, or None."""
+        return self._by_alias.get(label)
+    
+    @property
+    def page_table_ids(self):
+        return self.table_ids or (f"{self.stat_type}_stats",)
+    
+    def index_name(self, table_name, suffix):
+        # Index names are schema-wide, so a legacy prefix only fits the default table
+        if self.index_prefix is not None and table_name == self.table_name:
+            prefix = self.index_prefix
+        else:
+            prefix = f"idx_{table_name}_"
+        return f"{prefix}{suffix}"
+
+def _count(name, *aliases, sql_type='DECIMAL(7,1)'):
+    return ColumnSpec(name, sql_type, 'Int32', aliases)
+
+def _rate(name, *aliases):
+    return ColumnSpec(name, 'DECIMAL(5,3)', 'float32', aliases)
+
+def _avg(name, *aliases, sql_type='DECIMAL(5,1)'):
+    return ColumnSpec(name, sql_type, 'float32', aliases)
+
+SEASON_INDEXES = (
+    ('player_id', ('player_id',)),
+    ('player_id_season', ('player_id', 'season')),
+    ('player_season', ('player', 'season')),
+    ('season', ('season',)),
+)
+
+# Column order matches the original hand-written DDL for nba.player_season_totals
+TOTALS_SCHEMA = TableSchema(
+    stat_type='totals',
+    table_name='player_season_totals',
+    columns=(
+        ColumnSpec('player_id', 'VARCHAR(50)', None, ('PLAYER_ID',)),
+        ColumnSpec('player', 'VARCHAR(255)', None, ('Player',)),
+        _count('age', 'Age', sql_type='DECIMAL(5,2)'),
+        ColumnSpec('team', 'VARCHAR(10)', 'category', ('Tm', 'Team')),
+        ColumnSpec('pos', 'VARCHAR(10)', 'category', ('Pos',)),
+        _count('g', 'G', sql_type='DECIMAL(5,1)'),
+        _count('fg', 'FG'),
+        _count('fga', 'FGA'),
+        _rate('fg_pct', 'FG%'),
+        _count('ft', 'FT'),
+        _count('fta', 'FTA'),
+        _rate('ft_pct', 'FT%'),
+        _count('ast', 'AST'),
+        _count('pf', 'PF'),
+        _count('pts', 'PTS'),
+        ColumnSpec('awards', 'TEXT', None, ('Awards',)),
+        ColumnSpec('season', 'VARCHAR(10)', 'category', ('SEASON',)),
+        _count('trb', 'TRB'),
+        _count('mp', 'MP'),
+        _count('gs', 'GS', sql_type='DECIMAL(5,1)'),
+        _count('orb', 'ORB'),
+        _count('drb', 'DRB'),
+        _count('stl', 'STL'),
+        _count('blk', 'BLK'),
+        _count('tov', 'TOV'),
+        _count('three_p', '3P'),
+        _count('three_pa', '3PA'),
+        _rate('three_p_pct', '3P%'),
+        _count('two_p', '2P'),
+        _count('two_pa', '2PA'),
+        _rate('two_p_pct', '2P%'),
+        _rate('efg_pct', 'eFG%'),
+        _count('trp_dbl', 'Trp-Dbl', 'Trp Dbl', sql_type='INTEGER'),
+    ),
+    indexes=SEASON_INDEXES,
+    # Keep the index names existing databases already have
+    index_prefix='idx_',
+)
+
+# Identity columns shared by every player season table
+_PLAYER_HEAD = (
+    ColumnSpec('player_id', 'VARCHAR(50)', None, ('PLAYER_ID',)),
+    ColumnSpec('player', 'VARCHAR(255)', None, ('Player',)),
+    _count('age', 'Age', sql_type='DECIMAL(5,2)'),
+    ColumnSpec('team', 'VARCHAR(10)', 'category', ('Tm', 'Team')),
+    ColumnSpec('pos', 'VARCHAR(10)', 'category', ('Pos',)),
+    _count('g', 'G', sql_type='DECIMAL(5,1)'),
+    _count('gs', 'GS', sql_type='DECIMAL(5,1)'),
+)
+_PLAYER_TAIL = (
+    ColumnSpec('awards', 'TEXT', None, ('Awards',)),
+    ColumnSpec('season', 'VARCHAR(10)', 'category', ('SEASON',)),
+)
+
+# Box score rates shared by the per-game, per-36 and per-100 tables
+_RATE_BOX = (
+    _avg('fg', 'FG'), _avg('fga', 'FGA'), _rate('fg_pct', 'FG%'),
+    _avg('three_p', '3P'), _avg('three_pa', '3PA'), _rate('three_p_pct', '3P%'),
+    _avg('two_p', '2P'), _avg('two_pa', '2PA'), _rate('two_p_pct', '2P%'),
+    _rate('efg_pct', 'eFG%'),
+    _avg('ft', 'FT'), _avg('fta', 'FTA'), _rate('ft_pct', 'FT%'),
+    _avg('orb', 'ORB'), _avg('drb', 'DRB'), _avg('trb', 'TRB'),
+    _avg('ast', 'AST'), _avg('stl', 'STL'), _avg('blk', 'BLK'),
+    _avg('tov', 'TOV'), _avg('pf', 'PF'), _avg('pts', 'PTS'),
+)
+
+PER_GAME_SCHEMA = TableSchema(
+    stat_type='per_game',
+    table_name='player_season_per_game',
+    columns=_PLAYER_HEAD + (_avg('mp', 'MP'),) + _RATE_BOX + _PLAYER_TAIL,
+    indexes=SEASON_INDEXES,
+)
+
+PER_MINUTE_SCHEMA = TableSchema(
+    stat_type='per_minute',
+    table_name='player_season_per_36',
+    columns=_PLAYER_HEAD + (_count('mp', 'MP'),) + _RATE_BOX + _PLAYER_TAIL,
+    indexes=SEASON_INDEXES,
+    # Minutes were first recorded in 1951-52
+    first_season=1952,
+)
+
+PER_POSS_SCHEMA = TableSchema(
+    stat_type='per_poss',
+    table_name='player_season_per_poss',
+    columns=(_PLAYER_HEAD + (_count('mp', 'MP'),) + _RATE_BOX
+             + (_avg('ortg', 'ORtg'), _avg('drtg', 'DRtg')) + _PLAYER_TAIL),
+    indexes=SEASON_INDEXES,
+    # Possessions need turnovers and offensive rebounds, tracked from 1973-74
+    first_season=1974,
+)
+
+ADVANCED_SCHEMA = TableSchema(
+    stat_type='advanced',
+    table_name='player_season_advanced',
+    columns=_PLAYER_HEAD + (
+        _count('mp', 'MP'),
+        _avg('per', 'PER'),
+        _rate('ts_pct', 'TS%'),
+        _rate('three_par', '3PAr'),
+        _rate('ftr', 'FTr'),
+        _avg('orb_pct', 'ORB%'), _avg('drb_pct', 'DRB%'), _avg('trb_pct', 'TRB%'),
+        _avg('ast_pct', 'AST%'), _avg('stl_pct', 'STL%'), _avg('blk_pct', 'BLK%'),
+        _avg('tov_pct', 'TOV%'), _avg('usg_pct', 'USG%'),
+        _avg('ows', 'OWS'), _avg('dws', 'DWS'), _avg('ws', 'WS'),
+        _rate('ws_per_48', 'WS/48'),
+        _avg('obpm', 'OBPM'), _avg('dbpm', 'DBPM'), _avg('bpm', 'BPM'), _avg('vorp', 'VORP'),
+    ) + _PLAYER_TAIL,
+    indexes=SEASON_INDEXES,
+    table_ids=('advanced_stats', 'advanced'),
+)
+
+# The shooting table repeats labels across header groups ('2P', '0-3', ...),
+# so its columns are matched on data-stat keys
+SHOOTING_SCHEMA = TableSchema(
+    stat_type='shooting',
+    table_name='player_season_shooting',
+    columns=_PLAYER_HEAD + (
+        _count('mp', 'MP'),
+        _rate('fg_pct', 'FG%', 'fg_pct'),
+        _avg('avg_dist', 'Dist.', 'avg_dist'),
+        _rate('pct_fga_two_p', 'fg2a_pct_fga'),
+        _rate('pct_fga_00_03', 'pct_fga_00_03'),
+        _rate('pct_fga_03_10', 'pct_fga_03_10'),
+        _rate('pct_fga_10_16', 'pct_fga_10_16'),
+        _rate('pct_fga_16_xx', 'pct_fga_16_xx'),
+        _rate('pct_fga_three_p', 'fg3a_pct_fga'),
+        _rate('two_p_pct', 'fg2_pct'),
+        _rate('fg_pct_00_03', 'fg_pct_00_03'),
+        _rate('fg_pct_03_10', 'fg_pct_03_10'),
+        _rate('fg_pct_10_16', 'fg_pct_10_16'),
+        _rate('fg_pct_16_xx', 'fg_pct_16_xx'),
+        _rate('three_p_pct', 'fg3_pct'),
+        _rate('two_p_pct_ast', 'fg2_pct_ast'),
+        _rate('three_p_pct_ast', 'fg3_pct_ast'),
+        _rate('pct_fga_dunk', 'pct_fga_dunk'),
+        _count('dunks', 'fg_dunk', sql_type='INTEGER'),
+        _rate('pct_three_pa_corner', 'pct_fg3a_corner'),
+        _rate('corner_three_p_pct', 'fg3_pct_corner'),
+        _count('heave_att', 'fg3a_heave', sql_type='INTEGER'),
+        _count('heave_made', 'fg3_heave', sql_type='INTEGER'),
+    ) + _PLAYER_TAIL,
+    indexes=SEASON_INDEXES,
+    # Shot distance and location data start with 1996-97
+    first_season=1997,
+)
+
+ADJ_SHOOTING_SCHEMA = TableSchema(
+    stat_type='adj_shooting',
+    table_name='player_season_adj_shooting',
+    columns=_PLAYER_HEAD + (
+        _count('mp', 'MP'),
+        _rate('fg_pct', 'FG'), _rate('two_p_pct', '2P'), _rate('three_p_pct', '3P'),
+        _rate('efg_pct', 'eFG'), _rate('ft_pct', 'FT'), _rate('ts_pct', 'TS'),
+        _rate('ftr', 'FTr'), _rate('three_par', '3PAr'),
+        _count('fg_plus', 'FG+', sql_type='INTEGER'),
+        _count('two_p_plus', '2P+', sql_type='INTEGER'),
+        _count('three_p_plus', '3P+', sql_type='INTEGER'),
+        _count('efg_plus', 'eFG+', sql_type='INTEGER'),
+        _count('ft_plus', 'FT+', sql_type='INTEGER'),
+        _count('ts_plus', 'TS+', sql_type='INTEGER'),
+        _count('ftr_plus', 'FTr+', sql_type='INTEGER'),
+        _count('three_par_plus', '3PAr+', sql_type='INTEGER'),
+        _avg('fg_add', 'FG Add'),
+        _avg('ts_add', 'TS Add'),
+    ) + _PLAYER_TAIL,
+    indexes=SEASON_INDEXES,
+    table_ids=('adj_shooting_stats', 'adj-shooting', 'adj_shooting'),
+)
+
+SCHEMAS = {
+    table_schema.stat_type: table_schema
+    for table_schema in (
+        TOTALS_SCHEMA, PER_GAME_SCHEMA, PER_MINUTE_SCHEMA, PER_POSS_SCHEMA,
+        ADVANCED_SCHEMA, SHOOTING_SCHEMA, ADJ_SHOOTING_SCHEMA,
+    )
+}
+
+def build_table_ddl(table_schema, table_name=None, db_schema='nba', partitioned=False):
+    """
+    Generate the DDL for a registered table.
+    
+    Besides CREATE TABLE, every registered column gets an ADD COLUMN IF NOT
+    EXISTS so tables created from an older registry pick up new columns.
+    
+    With partitioned=True the table is LIST-partitioned by season (one
+    partition per season, see ensure_season_partition). Indexes declared on
+    the parent are created locally on every partition.
+    """
+    table_name = table_name or table_schema.table_name
+    qualified = f"{db_schema}.{table_name}"
+    # A partitioned table's primary key has to include the partition key
+    column_defs = ['id SERIAL' if partitioned else 'id SERIAL PRIMARY KEY']
+    for spec in table_schema.columns:
+        column_defs.append(f"{spec.name} {spec.sql_type}{'' if spec.nullable else ' NOT NULL'}")
+    column_defs.append('created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+    if partitioned:
+        column_defs.append('PRIMARY KEY (id, season)')
+    
+    create = f"CREATE TABLE IF NOT EXISTS {qualified} (\n    " + ",\n    ".join(column_defs) + "\n)"
+    if partitioned:
+        create += " PARTITION BY LIST (season)"
+    statements = [create]
+    for spec in table_schema.columns:
+        statements.append(f"ALTER TABLE {qualified} ADD COLUMN IF NOT EXISTS {spec.name} {spec.sql_type}")
+    statements.extend(secondary_index_ddl(table_schema, table_name, db_schema, partitioned))
+    return ";\n".join(statements) + ";"
+
+def secondary_index_ddl(table_schema, table_name=None, db_schema='nba', partitioned=False, concurrently=False):
+    """CREATE INDEX statements for a registered table's secondary indexes."""
+    table_name = table_name or table_schema.table_name
+    create = "CREATE INDEX CONCURRENTLY IF NOT EXISTS" if concurrently else "CREATE INDEX IF NOT EXISTS"
+    statements = []
+    for suffix, columns in table_schema.indexes:
+        # Every partition holds a single season, so a season-only index never helps
+        if partitioned and tuple(columns) == ('season',):
+            continue
+        statements.append(
+            f"{create} {table_schema.index_name(table_name, suffix)} "
+            f"ON {db_schema}.{table_name}({', '.join(columns)})"
+        )
+    return statements
+
+def _column_to_series(values, dtype=None, sniff=True):
+    """
+    Build a Series from raw cell text.
+    
+    With a declared dtype the column is converted straight to it (blanks
+    become NA). Otherwise it stays text, or, with sniff=True (columns the
+    registry does not know), turns numeric when every value parses.
+    """
+    series = pd.Series(values, dtype=object)
+    if dtype == 'category':
+        return series.astype('category')
+    if dtype is None and not sniff:
+        return series
+    numeric = pd.to_numeric(series, errors='coerce')
+    if dtype is not None:
+        return numeric.astype(dtype)
+    if numeric.notna().sum() == series.notna().sum():
+        return numeric
+    return series
+
+def stats_table_to_frame(parsed, stat_type=None):
+    """
+    Build a DataFrame from a parsed table.
+    
+    Columns of a registered stat type get their declared dtypes (registered
+    text columns stay text, even when a season leaves them all blank);
+    anything else is numeric when every value parses. Problem rows are listed in
+    df.attrs['row_issues'].
+    """
+    table_schema = SCHEMAS.get(stat_type)
+    header_counts = {}
+    for stat in parsed['stats']:
+        header = parsed['headers'][stat]
+        header_counts[header] = header_counts.get(header, 0) + 1
+    
+    data = {}
+    # Team and league summary tables have no player links
+    if table_schema is not None or any(parsed['player_ids']):
+        data['PLAYER_ID'] = parsed['player_ids']
+    for stat in parsed['stats']:
+        # Drop the rank column ('Rk')
+        if stat == 'ranker':
+            continue
+        header = parsed['headers'][stat]
+        # Repeated labels (grouped headers) are ambiguous; use the unique data-stat key
+        label = header if header_counts[header] == 1 else stat
+        spec = None
+        if table_schema is not None:
+            spec = table_schema.resolve(label)
+            if spec is None and table_schema.resolve(stat) is not None:
+                label, spec = stat, table_schema.resolve(stat)
+        data[label] = _column_to_series(parsed['columns'][stat], spec.dtype if spec else None, sniff=spec is None)
+    
+    df = pd.DataFrame(data)
+    df.attrs['row_issues'] = parsed['row_issues']
+    return df
+
+def parse_season_page(content, stat_type='totals', strict_rows=False):
+    """
+    Turn a downloaded season page into a DataFrame.
+    
+    Args:
+        content: Raw page HTML
+        stat_type: Basketball Reference stat type; the table id comes from its
+            registered schema (default '{stat_type}_stats')
+        strict_rows: Raise RowAlignmentError instead of reporting problem rows
+    
+    Returns:
+        DataFrame with one row per player-team season, PLAYER_ID first, or an
+        empty DataFrame if the table is missing. Problem rows are listed in
+        df.attrs['row_issues'].
+    """
+    table_schema = SCHEMAS.get(stat_type)
+    table_ids = table_schema.page_table_ids if table_schema is not None else f'{stat_type}_stats'
+    parsed = parse_stats_table(content, table_ids)
+    if parsed is None:
+        return pd.DataFrame()
+    
+    row_issues = parsed['row_issues']
+    if row_issues and strict_rows:
+        row_number, reason, label = row_issues[0]
+        raise RowAlignmentError(
+            f"{len(row_issues)} unaligned row(s) in {stat_type}_stats; "
+            f"first at tbody row {row_number} ({label!r}): {reason}"
+        )
+    
+    return stats_table_to_frame(parsed, stat_type)
+
+def season_page_url(season_end_year, stat_type='totals'):
+    """URL of one season's page for a stat type."""
+    return f"{HTTP_CONFIG['base_url']}/leagues/NBA_{season_end_year}_{stat_type}.html"
 
-def get_season_stats(season_end_year):
+def fetch_season_page(season_end_year, stat_type='totals'):
+    """Download (or read from cache) the raw page for one season and stat type."""
+    # Finished seasons never change, so they are served from the local cache
+    return fetch_page(season_page_url(season_end_year, stat_type),
+                      frozen=season_end_year < current_season_end_year())
+
+def get_season_stats(season_end_year, strict_rows=False):
     """
     Scrape season totals for all players from Basketball Reference.
     
     Args:
         season_end_year: The year the season ended (e.g., 2024 for 2023-24 season)
+        strict_rows: Fail the season if any row cannot be tied to its player
     
     Returns:
         DataFrame with all players' season totals for that season, including player_id
+    
+    Raises:
+        IngestionError: tagged with the error kind, after transient fetch
+            errors have been retried
     """
     stat_type = 'totals'
-    url = f'https://www.basketball-reference.com/leagues/NBA_{season_end_year}_{stat_type}.html'
     
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the stats table
-        table = soup.find('table', {'id': f'{stat_type}_stats'})
-        
-        if not table:
-            return pd.DataFrame()
-        
-        # Extract player IDs from the href links before reading table
-        player_ids = []
-        player_rows = table.find('tbody').find_all('tr')
-        
-        for row in player_rows:
-            # Find player link in the row
-            player_cell = row.find('td', {'data-stat': 'player'})
-            
-            if player_cell and player_cell.find('a'):
-                href = player_cell.find('a').get('href', '')
-                # Extract player_id from URL like /players/j/jamesle01.html
-                if href:
-                    player_id = href.split('/')[-1].replace('.html', '')
-                    player_ids.append(player_id)
-                else:
-                    player_ids.append(None)
-            else:
-                player_ids.append(None)
-        
-        # Read table into DataFrame
-        df = pd.read_html(str(table))[0]
-        
-        # Clean up the DataFrame
-        # Remove header rows that repeat in the table
-        df = df[df['Player'] != 'Player']
-        
-        # Drop the 'Rk' (Rank) column if it exists
-        if 'Rk' in df.columns:
-            df = df.drop('Rk', axis=1)
-        
-        df = df.reset_index(drop=True)
-        
-        # Add player_id column (match the cleaned dataframe length)
-        if len(player_ids) >= len(df):
-            df.insert(0, 'PLAYER_ID', player_ids[:len(df)])
-        else:
-            # If mismatch, fill with None
-            df.insert(0, 'PLAYER_ID', [player_ids[i] if i < len(player_ids) else None for i in range(len(df))])
-        
-        return df
+        content = call_with_retries(lambda: fetch_season_page(season_end_year, stat_type), {}, 'fetch',
+                                    RetryBudget(RETRY_CONFIG['max_attempts']))
+        return parse_season_page(content, stat_type, strict_rows=strict_rows)
         
     except Exception as e:
-        raise Exception(f"Error fetching data for {season_end_year}: {str(e)}")
-
-def create_table_if_not_exists(engine, table_name="player_season_totals"):
-    """Create the player season totals table if it doesn't exist."""
-    create_table_sql = f"""
-    CREATE TABLE IF NOT EXISTS nba.{table_name} (
-        id SERIAL PRIMARY KEY,
-        player_id VARCHAR(50),
-        player VARCHAR(255),
-        age DECIMAL(5,2),
-        team VARCHAR(10),
-        pos VARCHAR(10),
-        g DECIMAL(5,1),
-        fg DECIMAL(7,1),
-        fga DECIMAL(7,1),
-        fg_pct DECIMAL(5,3),
-        ft DECIMAL(7,1),
-        fta DECIMAL(7,1),
-        ft_pct DECIMAL(5,3),
-        ast DECIMAL(7,1),
-        pf DECIMAL(7,1),
-        pts DECIMAL(7,1),
-        awards TEXT,
-        season VARCHAR(10),
-        trb DECIMAL(7,1),
-        mp DECIMAL(7,1),
-        gs DECIMAL(5,1),
-        orb DECIMAL(7,1),
-        drb DECIMAL(7,1),
-        stl DECIMAL(7,1),
-        blk DECIMAL(7,1),
-        tov DECIMAL(7,1),
-        three_p DECIMAL(7,1),
-        three_pa DECIMAL(7,1),
-        three_p_pct DECIMAL(5,3),
-        two_p DECIMAL(7,1),
-        two_pa DECIMAL(7,1),
-        two_p_pct DECIMAL(5,3),
-        efg_pct DECIMAL(5,3),
-        trp_dbl INTEGER,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
+        raise IngestionError(f"Error fetching data for {season_end_year}: {str(e)}", classify_error(e)) from e
+
+def get_season_tables(season_end_year, stat_type='totals', table_ids=None):
+    """
+    Fetch one season page and pull several of its tables in a single parse.
+    
+    Args:
+        season_end_year: The year the season ended (e.g., 2024 for 2023-24 season)
+        stat_type: Which season page to fetch (e.g. 'totals', 'advanced')
+        table_ids: Table ids to extract (including ones hidden in HTML
+            comments, such as team or league summaries), or None for all
+    
+    Returns:
+        dict of table id -> DataFrame; the page's own stats table is typed
+        with its registered schema
+    """
+    try:
+        content = call_with_retries(lambda: fetch_season_page(season_end_year, stat_type), {}, 'fetch',
+                                    RetryBudget(RETRY_CONFIG['max_attempts']))
+        table_schema = SCHEMAS.get(stat_type)
+        own_ids = set(table_schema.page_table_ids) if table_schema is not None else {f'{stat_type}_stats'}
+        return {
+            table_id: stats_table_to_frame(parsed, stat_type if table_id in own_ids else None)
+            for table_id, parsed in extract_tables(content, table_ids).items()
+        }
+    except Exception as e:
+        raise IngestionError(f"Error fetching tables for {season_end_year}: {str(e)}", classify_error(e)) from e
+
+def create_table_if_not_exists(engine, table_name="player_season_totals", stat_type='totals',
+                               partitioned=False):
+    """
+    Create (or add missing columns to) a season table from its registered schema.
     
-    CREATE INDEX IF NOT EXISTS idx_player_id ON nba.{table_name}(player_id);
-    CREATE INDEX IF NOT EXISTS idx_player_id_season ON nba.{table_name}(player_id, season);
-    CREATE INDEX IF NOT EXISTS idx_player_season ON nba.{table_name}(player, season);
-    CREATE INDEX IF NOT EXISTS idx_season ON nba.{table_name}(season);
+    partitioned=True only applies when the table is created; an existing
+    table keeps its layout (see table_is_partitioned).
     """
+    create_table_sql = build_table_ddl(SCHEMAS[stat_type], table_name, partitioned=partitioned)
     
     try:
         with engine.connect() as conn:
@@ -217,149 +1306,1807 @@ def create_table_if_not_exists(engine, table_name="player_season_totals"):
         print(f"❌ Error creating table: {e}")
         return False
 
-def get_all_seasons(start_year=1950, end_year=2025, save_to_db=True, table_name="player_season_totals"):
+def prepare_table(engine, table_name="player_season_totals", stat_type='totals', partitioned=False):
     """
-    Fetch all NBA player season totals using Basketball Reference Scraper.
-    
-    Args:
-        start_year: First season end year to fetch (default: 1950)
-        end_year: Last season end year to fetch (default: 2025)
-        save_to_db: Whether to save data to PostgreSQL (default: True)
-        table_name: Name of the database table (default: player_season_totals)
+    Create a season table once per process and report its layout.
     
     Returns:
-        DataFrame with all fetched season totals
+        {'partitioned': bool}, or None if the table could not be created
     """
-    engine = None
-    if save_to_db:
-        engine = get_db_connection()
-        if engine is None:
-            print("⚠️  Could not connect to database. Proceeding without saving to DB.")
-            save_to_db = False
-        else:
-            create_table_if_not_exists(engine, table_name)
+    def setup():
+        if not create_table_if_not_exists(engine, table_name, stat_type, partitioned):
+            return None
+        return {'partitioned': table_is_partitioned(engine, table_name)}
     
-    print(f"\n🏀 NBA Season Totals Ingestion - Basketball Reference Scraper")
-    print(f"📅 Season range: {start_year-1}-{start_year} to {end_year-1}-{end_year}")
-    print(f"📊 Total seasons: {end_year - start_year + 1}")
-    if save_to_db:
-        print(f"💾 Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
-        print(f"📋 Table: nba.{table_name}")
-    print(f"⏱️  Estimated time: ~{(end_year - start_year + 1)} seconds (with rate limiting)\n")
+    return bootstrap_once(('table', table_name, stat_type, partitioned), setup)
+
+def table_is_partitioned(engine, table_name, schema='nba'):
+    """Whether schema.table_name is a partitioned (parent) table."""
+    with engine.connect() as conn:
+        relkind = conn.execute(
+            text(
+                "SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relname = :table_name"
+            ),
+            {'schema': schema, 'table_name': table_name},
+        ).scalar()
+    return relkind == 'p'
+
+def drop_secondary_indexes(engine, table_name, table_schema=TOTALS_SCHEMA, schema='nba'):
+    """
+    Drop a table's secondary indexes ahead of a bulk load.
+    
+    The unique natural-key index upserts conflict on and the primary key
+    are kept. Rebuild with build_secondary_indexes once loading is done.
+    """
+    try:
+        with engine.connect() as conn:
+            for suffix, _ in table_schema.indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {schema}.{table_schema.index_name(table_name, suffix)}"))
+            conn.commit()
+        print(f"🗑️  Dropped secondary indexes on {schema}.{table_name} for the bulk load")
+        return True
+    except Exception as e:
+        print(f"❌ Error dropping indexes: {e}")
+        return False
+
+def build_secondary_indexes(engine, table_name, table_schema=TOTALS_SCHEMA, schema='nba',
+                            partitioned=False, concurrently=False):
+    """
+    (Re)build a table's secondary indexes, then ANALYZE it.
     
-    all_data = []
-    successful_seasons = 0
-    failed_seasons = []
+    Args:
+        engine: SQLAlchemy engine
+        table_name: Table in `schema`
+        table_schema: Registered TableSchema the table was created from
+        schema: Database schema (default: nba)
+        partitioned: Whether the table is partitioned by season
+        concurrently: Build with CREATE INDEX CONCURRENTLY so readers and
+            writers are not blocked (ignored for partitioned tables, which
+            PostgreSQL cannot index concurrently)
+    """
+    if concurrently and partitioned:
+        print(f"⚠️  Partitioned tables cannot be indexed concurrently; building {schema}.{table_name} indexes normally.")
+        concurrently = False
+    statements = secondary_index_ddl(table_schema, table_name, schema, partitioned, concurrently)
+    started = time.time()
+    try:
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+            conn.execute(text(f"ANALYZE {schema}.{table_name}"))
+        print(f"🔧 Built {len(statements)} index(es) and analyzed {schema}.{table_name} "
+              f"in {time.time() - started:.1f}s")
+        return True
+    except Exception as e:
+        print(f"❌ Error building indexes: {e}")
+        return False
+
+def partition_name(table_name, season_end_year):
+    """Name of the partition holding one season, e.g. player_season_totals_2024."""
+    return f"{table_name}_{season_end_year}"
+
+def ensure_season_partition(engine, table_name, season_end_year, schema='nba'):
+    """
+    Create the partition for one season of a partitioned table if it is missing.
     
+    Returns:
+        Partition table name (in `schema`)
+    """
+    partition = partition_name(table_name, season_end_year)
+    
+    def create_partition():
+        with engine.connect() as conn:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {schema}.{partition} "
+                f"PARTITION OF {schema}.{table_name} FOR VALUES IN ('{season_label(season_end_year)}')"
+            ))
+            conn.commit()
+        return partition
+    
+    return bootstrap_once(('partition', schema, partition), create_partition)
+
+# Month (of the season end year) after which a season's stats are final
+SEASON_FINAL_MONTH = 7
+
+def create_ingestion_state_table(engine):
+    """Create nba.ingestion_state, which records when each season was last loaded per table."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS nba.ingestion_state (
+                table_name VARCHAR(100) NOT NULL,
+                season VARCHAR(10) NOT NULL,
+                row_count INTEGER,
+                loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (table_name, season)
+            )
+            """))
+            conn.commit()
+        return True
+    except Exception as e:
+        print(f"❌ Error creating ingestion state table: {e}")
+        return False
+
+def season_loaded_statement(table_name, season, row_count):
+    """(SQL with :named parameters, parameters) that marks a season as loaded into table_name now."""
+    statement = (
+        "INSERT INTO nba.ingestion_state (table_name, season, row_count, loaded_at) "
+        "VALUES (:table_name, :season, :row_count, CURRENT_TIMESTAMP) "
+        "ON CONFLICT (table_name, season) DO UPDATE "
+        "SET row_count = EXCLUDED.row_count, loaded_at = EXCLUDED.loaded_at"
+    )
+    return statement, {'table_name': table_name, 'season': season, 'row_count': row_count}
+
+def get_loaded_seasons(engine, table_name):
+    """
+    Return {season: loaded_at} for seasons already in nba.{table_name}.
+    
+    nba.ingestion_state is authoritative; seasons loaded before it existed
+    fall back to MAX(created_at) from the data table itself.
+    """
+    with engine.connect() as conn:
+        legacy = conn.execute(text(
+            f"SELECT season, MAX(created_at) FROM nba.{table_name} GROUP BY season"
+        ))
+        loaded = {season: loaded_at for season, loaded_at in legacy if season is not None}
+        state = conn.execute(
+            text("SELECT season, loaded_at FROM nba.ingestion_state WHERE table_name = :table_name"),
+            {'table_name': table_name},
+        )
+        loaded.update({season: loaded_at for season, loaded_at in state})
+    return loaded
+
+def plan_seasons(engine, table_name, start_year, end_year):
+    """
+    Pick the seasons an incremental run has to fetch.
+    
+    A season is planned when it is missing from the table, still in progress,
+    or was last loaded before it finished (so its stats were partial).
+    
+    Returns:
+        Sorted list of season end years
+    """
+    loaded = get_loaded_seasons(engine, table_name)
+    current = current_season_end_year()
+    planned = []
     for year in range(start_year, end_year + 1):
-        try:
-            print(f"📊 Fetching {year-1}-{year} season... ", end="", flush=True)
-            
-            # Fetch season totals from Basketball Reference
-            df = get_season_stats(season_end_year=year)
-            
-            if df is None or df.empty:
-                print(f"⚠️  No data returned for {year}")
-                failed_seasons.append(year)
-                time.sleep(1)
+        loaded_at = loaded.get(season_label(year))
+        if loaded_at is None or year >= current:
+            planned.append(year)
+        elif loaded_at < datetime(year, SEASON_FINAL_MONTH, 1):
+            planned.append(year)
+    return planned
+
+def create_ledger_tables(engine):
+    """Create the checkpoint ledger: nba.ingestion_runs and nba.ingestion_seasons."""
+    ledger_sql = """
+    CREATE TABLE IF NOT EXISTS nba.ingestion_runs (
+        run_id SERIAL PRIMARY KEY,
+        table_name VARCHAR(100) NOT NULL,
+        start_year INTEGER NOT NULL,
+        end_year INTEGER NOT NULL,
+        load_mode VARCHAR(20) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'running',
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at TIMESTAMP
+    );
+    
+    CREATE TABLE IF NOT EXISTS nba.ingestion_seasons (
+        run_id INTEGER NOT NULL REFERENCES nba.ingestion_runs(run_id),
+        season_end_year INTEGER NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        row_count INTEGER,
+        content_hash CHAR(64),
+        duration_ms INTEGER,
+        error TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (run_id, season_end_year)
+    );
+    """
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(ledger_sql))
+            conn.commit()
+        return True
+    except Exception as e:
+        print(f"❌ Error creating ingestion ledger: {e}")
+        return False
+
+def start_run(engine, table_name, start_year, end_year, load_mode, years=None):
+    """
+    Open a new run in the ledger and return its run_id.
+    
+    The seasons the run plans to load (`years`, default the whole range)
+    get 'pending' rows, so a resumed run only picks up what this one
+    planned and did not finish.
+    """
+    if years is None:
+        years = range(start_year, end_year + 1)
+    with engine.connect() as conn:
+        run_id = conn.execute(
+            text(
+                "INSERT INTO nba.ingestion_runs (table_name, start_year, end_year, load_mode) "
+                "VALUES (:table_name, :start_year, :end_year, :load_mode) RETURNING run_id"
+            ),
+            {'table_name': table_name, 'start_year': start_year, 'end_year': end_year, 'load_mode': load_mode},
+        ).scalar()
+        if years:
+            conn.execute(
+                text(
+                    "INSERT INTO nba.ingestion_seasons (run_id, season_end_year, status) "
+                    "VALUES (:run_id, :year, 'pending')"
+                ),
+                [{'run_id': run_id, 'year': year} for year in years],
+            )
+        conn.commit()
+    return run_id
+
+def find_resumable_run(engine, table_name):
+    """
+    Find the most recent run for a table that did not complete.
+    
+    Returns:
+        dict with run_id, start_year, end_year, load_mode, done_years
+        (seasons already loaded by that run) and years (seasons it planned
+        but has not loaded yet), or None
+    """
+    with engine.connect() as conn:
+        run = conn.execute(
+            text(
+                "SELECT run_id, start_year, end_year, load_mode, status FROM nba.ingestion_runs "
+                "WHERE table_name = :table_name ORDER BY run_id DESC LIMIT 1"
+            ),
+            {'table_name': table_name},
+        ).first()
+        if run is None or run.status == 'completed':
+            return None
+        seasons = conn.execute(
+            text("SELECT season_end_year, status FROM nba.ingestion_seasons WHERE run_id = :run_id"),
+            {'run_id': run.run_id},
+        ).fetchall()
+    done_years = {year for year, status in seasons if status == 'loaded'}
+    if seasons:
+        years = sorted(year for year, status in seasons if status != 'loaded')
+    else:
+        # Runs started before seasons were planned up front
+        years = [year for year in range(run.start_year, run.end_year + 1) if year not in done_years]
+    return {
+        'run_id': run.run_id,
+        'start_year': run.start_year,
+        'end_year': run.end_year,
+        'load_mode': run.load_mode,
+        'done_years': done_years,
+        'years': years,
+    }
+
+def season_result_statement(run_id, season_end_year, status, row_count=None,
+                            content_hash=None, duration=None, error=None):
+    """(SQL with :named parameters, parameters) that checkpoints one season's outcome for a run."""
+    statement = (
+        "INSERT INTO nba.ingestion_seasons "
+        "(run_id, season_end_year, status, row_count, content_hash, duration_ms, error, updated_at) "
+        "VALUES (:run_id, :year, :status, :row_count, :content_hash, :duration_ms, :error, CURRENT_TIMESTAMP) "
+        "ON CONFLICT (run_id, season_end_year) DO UPDATE SET "
+        "status = EXCLUDED.status, row_count = EXCLUDED.row_count, "
+        "content_hash = EXCLUDED.content_hash, duration_ms = EXCLUDED.duration_ms, "
+        "error = EXCLUDED.error, updated_at = EXCLUDED.updated_at"
+    )
+    return statement, {
+        'run_id': run_id,
+        'year': season_end_year,
+        'status': status,
+        'row_count': row_count,
+        'content_hash': content_hash,
+        'duration_ms': int(duration * 1000) if duration is not None else None,
+        'error': str(error)[:1000] if error is not None else None,
+    }
+
+def record_season_result(engine, run_id, season_end_year, status, row_count=None,
+                         content_hash=None, duration=None, error=None):
+    """Checkpoint one season's outcome for a run."""
+    statement, params = season_result_statement(run_id, season_end_year, status, row_count,
+                                                content_hash, duration, error)
+    with engine.connect() as conn:
+        conn.execute(text(statement), params)
+        conn.commit()
+
+_NAMED_PARAM = re.compile(r'(?<!:):(\w+)')
+
+def _execute_checkpoint(cursor, checkpoint):
+    """
+    Run checkpoint statements on a psycopg2 cursor inside the load's transaction.
+    
+    Loaders take these as `checkpoint`: a list of (SQL with :named
+    parameters, parameters), e.g. from season_loaded_statement and
+    season_result_statement. They commit with the rows or not at all, so the
+    ledger never disagrees with the table.
+    """
+    for statement, params in checkpoint or ():
+        cursor.execute(_NAMED_PARAM.sub(r'%(\1)s', statement), params)
+
+async def _async_execute_checkpoint(conn, checkpoint):
+    """asyncpg counterpart of _execute_checkpoint (named parameters become $1, $2, ...)."""
+    for statement, params in checkpoint or ():
+        names = _NAMED_PARAM.findall(statement)
+        positions = iter(range(1, len(names) + 1))
+        await conn.execute(_NAMED_PARAM.sub(lambda _: f"${next(positions)}", statement),
+                           *(params[name] for name in names))
+
+def finish_run(engine, run_id, status):
+    """Close a run with its final status ('completed', 'failed' or 'interrupted')."""
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "UPDATE nba.ingestion_runs SET status = :status, finished_at = CURRENT_TIMESTAMP "
+                "WHERE run_id = :run_id"
+            ),
+            {'run_id': run_id, 'status': status},
+        )
+        conn.commit()
+
+def frame_content_hash(df):
+    """SHA-256 of a DataFrame's values, used to tell whether a season's data changed."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False)
+    return hashlib.sha256(row_hashes.values.tobytes()).hexdigest()
+
+def _csv_buffer(df, columns):
+    """Render DataFrame columns as headerless CSV, the COPY input both drivers use."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, columns=columns, index=False, header=False, na_rep='')
+    buffer.seek(0)
+    return buffer
+
+def _copy_into(cursor, df, qualified_table, columns):
+    """Stream the given DataFrame columns into a table with COPY ... FROM STDIN (CSV)."""
+    column_list = ', '.join(columns)
+    cursor.copy_expert(f"COPY {qualified_table} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                       _csv_buffer(df, columns))
+
+def copy_dataframe_to_table(engine, df, table_name, table_schema=TOTALS_SCHEMA, schema='nba', checkpoint=None):
+    """
+    Bulk load a DataFrame with COPY ... FROM STDIN (CSV) via psycopg2's copy_expert.
+    
+    Args:
+        engine: SQLAlchemy engine
+        df: DataFrame whose column names already match the table
+        table_name: Target table in `schema`
+        table_schema: Registered TableSchema the table was created from
+        schema: Database schema (default: nba)
+        checkpoint: Ledger statements committed together with the rows
+            (see _execute_checkpoint)
+    
+    Returns:
+        (rows loaded, DataFrame columns that have no matching table column)
+    """
+    # Column order follows the registry; server-side defaults fill the rest
+    columns, skipped = table_schema.split_columns(df)
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        _copy_into(cursor, df, f"{schema}.{table_name}", columns)
+        _execute_checkpoint(cursor, checkpoint)
+        cursor.close()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    
+    return len(df), skipped
+
+def create_upsert_index(engine, table_name, table_schema=TOTALS_SCHEMA, schema='nba'):
+    """Create the unique index on the schema's natural key that upsert loads conflict on."""
+    key_list = ', '.join(table_schema.natural_key)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table_name}_natural_key "
+                f"ON {schema}.{table_name} ({key_list})"
+            ))
+            conn.commit()
+        return True
+    except Exception as e:
+        print(f"❌ Error creating unique index on ({key_list}); "
+              f"remove duplicate rows from {schema}.{table_name} first: {e}")
+        return False
+
+def drop_null_keys(df, table_schema=TOTALS_SCHEMA):
+    """
+    Split off rows with a NULL in any natural key column before an upsert.
+    
+    A unique index treats NULLs as distinct, so such rows never conflict and
+    would be inserted again on every upsert of their season.
+    
+    Returns:
+        (DataFrame of fully keyed rows, number of rows dropped)
+    """
+    key = [col for col in table_schema.natural_key if col in df.columns]
+    keyed = df[df[key].notna().all(axis=1)] if key else df
+    return keyed, len(df) - len(keyed)
+
+def _stage_table_sql(stage, target, columns):
+    """Temp staging table with only the loaded columns (no SERIAL default, no constraints)."""
+    return f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {', '.join(columns)} FROM {target} WITH NO DATA"
+
+def _merge_sql(table_schema, columns, target, stage):
+    """INSERT ... ON CONFLICT that merges a staging table, rewriting only rows whose values changed."""
+    key = table_schema.natural_key
+    column_list = ', '.join(columns)
+    update_columns = [col for col in columns if col not in key]
+    
+    if update_columns:
+        assignments = ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        current = ', '.join(f"target.{col}" for col in update_columns)
+        incoming = ', '.join(f"EXCLUDED.{col}" for col in update_columns)
+        conflict_action = (
+            f"DO UPDATE SET {assignments} "
+            f"WHERE ({current}) IS DISTINCT FROM ({incoming})"
+        )
+    else:
+        conflict_action = "DO NOTHING"
+    
+    return (
+        f"INSERT INTO {target} AS target ({column_list}) "
+        f"SELECT {column_list} FROM {stage} "
+        f"ON CONFLICT ({', '.join(key)}) {conflict_action}"
+    )
+
+def upsert_dataframe(engine, df, table_name, table_schema=TOTALS_SCHEMA, schema='nba', checkpoint=None):
+    """
+    Idempotently load a DataFrame keyed on the schema's natural key.
+    
+    Rows are COPYed into a temporary staging table, then merged with one
+    INSERT ... ON CONFLICT DO UPDATE that only rewrites rows whose values
+    actually changed. The whole merge runs in a single transaction.
+    
+    Args:
+        engine: SQLAlchemy engine
+        df: DataFrame whose column names already match the table
+        table_name: Target table in `schema` (needs create_upsert_index)
+        table_schema: Registered TableSchema the table was created from
+        schema: Database schema (default: nba)
+        checkpoint: Ledger statements committed together with the merge
+            (see _execute_checkpoint)
+    
+    Returns:
+        (rows inserted or updated, DataFrame columns that have no matching table column)
+    """
+    columns, skipped = table_schema.split_columns(df)
+    target = f"{schema}.{table_name}"
+    stage = f"{table_name}_stage"
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        cursor.execute(_stage_table_sql(stage, target, columns))
+        _copy_into(cursor, df, stage, columns)
+        cursor.execute(_merge_sql(table_schema, columns, target, stage))
+        changed = cursor.rowcount
+        _execute_checkpoint(cursor, checkpoint)
+        cursor.close()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    
+    return changed, skipped
+
+def _shadow_index_ddl(engine, table_name, shadow, table_schema, schema='nba'):
+    """
+    Index statements that give a shadow partition the same indexes as its parent.
+    
+    Matching indexes are adopted as-is by ATTACH PARTITION, so nothing has
+    to be built while the swap holds its locks.
+    
+    Returns:
+        list of (index name suffix, statement); indexes are named
+        '{shadow}_{suffix}' and renamed after the swap
+    """
+    qualified = f"{schema}.{shadow}"
+    statements = [('pkey', f"ALTER TABLE {qualified} ADD CONSTRAINT {shadow}_pkey PRIMARY KEY (id, season)")]
+    for suffix, columns in table_schema.indexes:
+        if tuple(columns) != ('season',):
+            statements.append((suffix, f"CREATE INDEX {shadow}_{suffix} ON {qualified} ({', '.join(columns)})"))
+    with engine.connect() as conn:
+        has_natural_key = conn.execute(
+            text("SELECT 1 FROM pg_indexes WHERE schemaname = :schema AND indexname = :index_name"),
+            {'schema': schema, 'index_name': f"uq_{table_name}_natural_key"},
+        ).scalar()
+    if has_natural_key:
+        statements.append(('natural_key', f"CREATE UNIQUE INDEX {shadow}_natural_key "
+                                          f"ON {qualified} ({', '.join(table_schema.natural_key)})"))
+    return statements
+
+def swap_season_partition(engine, df, table_name, season_end_year, table_schema=TOTALS_SCHEMA, schema='nba',
+                          checkpoint=None):
+    """
+    Atomically replace one season of a partitioned table with a shadow partition.
+    
+    The season is COPYed into a standalone shadow table, indexed and
+    analyzed there, then swapped in with DETACH / DROP / ATTACH in a single
+    transaction. Readers see either the old season or the new one, never a
+    partial load, and no dead tuples are left behind to vacuum. `checkpoint`
+    statements commit with the swap.
+    
+    Returns:
+        (rows loaded, DataFrame columns that have no matching table column)
+    """
+    columns, skipped = table_schema.split_columns(df)
+    season = season_label(season_end_year)
+    partition = partition_name(table_name, season_end_year)
+    shadow = f"{partition}_shadow"
+    index_ddl = _shadow_index_ddl(engine, table_name, shadow, table_schema, schema)
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        # A failed reload can leave its shadow behind
+        cursor.execute(f"DROP TABLE IF EXISTS {schema}.{shadow}")
+        cursor.execute(f"CREATE TABLE {schema}.{shadow} (LIKE {schema}.{table_name} INCLUDING DEFAULTS)")
+        # Lets ATTACH PARTITION trust the rows without scanning them
+        cursor.execute(
+            f"ALTER TABLE {schema}.{shadow} ADD CONSTRAINT {shadow}_season "
+            f"CHECK (season IS NOT NULL AND season = %s)",
+            (season,),
+        )
+        _copy_into(cursor, df, f"{schema}.{shadow}", columns)
+        for _, statement in index_ddl:
+            cursor.execute(statement)
+        cursor.execute(f"ANALYZE {schema}.{shadow}")
+        raw_conn.commit()
+        
+        cursor.execute("SELECT to_regclass(%s)", (f"{schema}.{partition}",))
+        if cursor.fetchone()[0] is not None:
+            cursor.execute(f"ALTER TABLE {schema}.{table_name} DETACH PARTITION {schema}.{partition}")
+            cursor.execute(f"DROP TABLE {schema}.{partition}")
+        cursor.execute(f"ALTER TABLE {schema}.{shadow} RENAME TO {partition}")
+        for suffix, _ in index_ddl:
+            cursor.execute(f"ALTER INDEX {schema}.{shadow}_{suffix} RENAME TO {partition}_{suffix}")
+        cursor.execute(
+            f"ALTER TABLE {schema}.{table_name} ATTACH PARTITION {schema}.{partition} FOR VALUES IN (%s)",
+            (season,),
+        )
+        cursor.execute(f"ALTER TABLE {schema}.{partition} DROP CONSTRAINT {shadow}_season")
+        _execute_checkpoint(cursor, checkpoint)
+        cursor.close()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    
+    return len(df), skipped
+
+def replace_season(engine, df, table_name, season_end_year, table_schema=TOTALS_SCHEMA,
+                   schema='nba', partitioned=False, checkpoint=None):
+    """
+    Replace one season's rows so readers never see it half loaded.
+    
+    Partitioned tables swap in a freshly built partition (see
+    swap_season_partition). Regular tables get the season COPYed into a
+    temporary staging table first, then deleted and re-inserted from it in
+    one short transaction.
+    
+    Args:
+        engine: SQLAlchemy engine
+        df: One season of rows whose column names already match the table
+        table_name: Target table in `schema`
+        season_end_year: Season being replaced
+        table_schema: Registered TableSchema the table was created from
+        schema: Database schema (default: nba)
+        partitioned: Whether table_name is partitioned by season
+        checkpoint: Ledger statements committed together with the new rows
+            (see _execute_checkpoint)
+    
+    Returns:
+        (rows loaded, DataFrame columns that have no matching table column)
+    """
+    if partitioned:
+        return swap_season_partition(engine, df, table_name, season_end_year, table_schema, schema, checkpoint)
+    
+    columns, skipped = table_schema.split_columns(df)
+    target = f"{schema}.{table_name}"
+    stage = f"{table_name}_stage"
+    column_list = ', '.join(columns)
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        cursor.execute(_stage_table_sql(stage, target, columns))
+        _copy_into(cursor, df, stage, columns)
+        cursor.execute(f"DELETE FROM {target} WHERE season = %s", (season_label(season_end_year),))
+        cursor.execute(f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {stage}")
+        _execute_checkpoint(cursor, checkpoint)
+        cursor.close()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    
+    return len(df), skipped
+
+async def create_async_db_pool():
+    """
+    Open an asyncpg pool sized like the SQLAlchemy one.
+    
+    Returns:
+        asyncpg pool, or None if asyncpg is missing or the connection fails
+    """
+    if asyncpg is None:
+        return None
+    try:
+        return await asyncpg.create_pool(
+            host=DB_CONFIG['host'],
+            port=int(DB_CONFIG['port']),
+            database=DB_CONFIG['database'],
+            user=DB_CONFIG['user'],
+            password=DB_CONFIG['password'],
+            min_size=1,
+            max_size=DB_POOL_CONFIG['pool_size'],
+            max_inactive_connection_lifetime=DB_POOL_CONFIG['pool_recycle'],
+        )
+    except Exception as e:
+        print(f"⚠️  Could not open an asyncpg pool ({e}); loading through psycopg2 instead.")
+        return None
+
+async def _async_copy_into(conn, df, table, columns, schema=None):
+    """asyncpg counterpart of _copy_into (same CSV rendering)."""
+    buffer = io.BytesIO(_csv_buffer(df, columns).getvalue().encode())
+    await conn.copy_to_table(table, source=buffer, columns=columns, schema_name=schema, format='csv')
+
+async def async_copy_dataframe_to_table(pool, df, table_name, table_schema=TOTALS_SCHEMA, schema='nba',
+                                        checkpoint=None):
+    """
+    Async counterpart of copy_dataframe_to_table on an asyncpg pool.
+    
+    Returns:
+        (rows loaded, DataFrame columns that have no matching table column)
+    """
+    columns, skipped = table_schema.split_columns(df)
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await _async_copy_into(conn, df, table_name, columns, schema)
+            await _async_execute_checkpoint(conn, checkpoint)
+    return len(df), skipped
+
+async def async_upsert_dataframe(pool, df, table_name, table_schema=TOTALS_SCHEMA, schema='nba',
+                                 checkpoint=None):
+    """
+    Async counterpart of upsert_dataframe on an asyncpg pool.
+    
+    Temp staging tables are per connection, so seasons can be merged
+    concurrently on different pooled connections.
+    
+    Returns:
+        (rows inserted or updated, DataFrame columns that have no matching table column)
+    """
+    columns, skipped = table_schema.split_columns(df)
+    stage = f"{table_name}_stage"
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(_stage_table_sql(stage, f"{schema}.{table_name}", columns))
+            await _async_copy_into(conn, df, stage, columns)
+            status = await conn.execute(_merge_sql(table_schema, columns, f"{schema}.{table_name}", stage))
+            await _async_execute_checkpoint(conn, checkpoint)
+    # Command tag, e.g. 'INSERT 0 42'
+    return int(status.rsplit(' ', 1)[-1]), skipped
+
+# Parquet Data Lake Configuration
+PARQUET_CONFIG = {
+    'root': os.getenv('PARQUET_ROOT', os.path.join('data', 'lake')),
+    'compression': 'zstd',
+    'compression_level': int(os.getenv('PARQUET_ZSTD_LEVEL', '3')),
+    # Uncompressed Arrow IPC mirror that readers can memory-map without decoding
+    'ipc_root': os.getenv('ARROW_IPC_ROOT', os.path.join('data', 'lake_ipc')),
+}
+
+SINKS = ('postgres', 'parquet', 'both')
+
+def season_parquet_path(season_end_year, stat_type='totals', root=None):
+    """Hive-style path of one season's file, e.g. season=2023-24/stat_type=totals/part-0.parquet."""
+    return os.path.join(
+        root or PARQUET_CONFIG['root'],
+        f"season={season_label(season_end_year)}",
+        f"stat_type={stat_type}",
+        'part-0.parquet',
+    )
+
+def arrow_schema(table_schema):
+    """
+    Arrow schema of a registered table's Parquet files, derived from its ColumnSpecs.
+    
+    Every season is written against it, so a column's type never depends on
+    what one season happened to contain. Season lives in the partition
+    directory names and is left out.
+    """
+    arrow_types = {
+        'Int32': pa.int32(),
+        'float32': pa.float32(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        None: pa.string(),
+    }
+    return pa.schema([pa.field(spec.name, arrow_types[spec.dtype])
+                      for spec in table_schema.columns if spec.name != 'season'])
+
+def write_season_parquet(df, season_end_year, stat_type='totals', root=None):
+    """
+    Write one season's typed frame into the Hive-partitioned Parquet dataset.
+    
+    The file is zstd-compressed with column statistics and replaces any
+    previous copy atomically, so readers never see a partial file. Season
+    and stat type live in the directory names, not in the file. Columns
+    follow the registered schema (see arrow_schema): ones the season lacks
+    are written as nulls, and ones the registry does not know are dropped,
+    as they are for the database.
+    
+    Args:
+        df: One season of rows with table column names
+        season_end_year: Season the rows belong to
+        stat_type: Stat type of the rows
+        root: Dataset root (default: PARQUET_CONFIG['root'])
+    
+    Returns:
+        Path of the written file
+    """
+    if pq is None:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+    path = season_parquet_path(season_end_year, stat_type, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    schema = arrow_schema(SCHEMAS[stat_type])
+    table = pa.Table.from_arrays(
+        [pa.array(df[name], from_pandas=True).cast(schema.field(name).type) if name in df.columns
+         else pa.nulls(len(df), schema.field(name).type)
+         for name in schema.names],
+        schema=schema,
+    )
+    
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        pq.write_table(
+            table,
+            tmp_path,
+            compression=PARQUET_CONFIG['compression'],
+            compression_level=PARQUET_CONFIG['compression_level'],
+            write_statistics=True,
+        )
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def export_arrow_ipc(root=None, ipc_root=None):
+    """
+    Mirror the Parquet dataset as uncompressed Arrow IPC files.
+    
+    IPC files are memory-mapped by load_season_totals and read without any
+    decoding, which suits repeated full-history scans. The Hive layout is
+    kept and every file is replaced atomically.
+    
+    Returns:
+        Number of files written
+    """
+    if pq is None:
+        raise RuntimeError("Arrow IPC export needs pyarrow: pip install pyarrow")
+    root = root or PARQUET_CONFIG['root']
+    ipc_root = ipc_root or PARQUET_CONFIG['ipc_root']
+    written = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if not filename.endswith('.parquet'):
                 continue
-            
-            # Add season identifier
-            df["SEASON"] = f"{year-1}-{str(year)[-2:]}"
-            
-            print(f"✅ {len(df):,} players", end="")
-            
-            # Save to database if enabled
-            if save_to_db and engine is not None:
-                try:
-                    df_db = df.copy()
-                    # Clean column names for PostgreSQL compatibility
-                    df_db.columns = (df_db.columns
-                                     .str.lower()
-                                     .str.replace('%', '_pct')
-                                     .str.replace('3p', 'three_p')
-                                     .str.replace('2p', 'two_p')
-                                     .str.replace('-', '_'))
-                    
-                    # Insert with chunking to avoid too many parameters error
-                    df_db.to_sql(
-                        table_name, 
-                        engine, 
-                        if_exists='append', 
-                        index=False, 
-                        method='multi',
-                        chunksize=500,  # Insert in batches of 500 rows
-                        schema='nba'
-                    )
-                    print(f" → 💾 Saved to DB")
-                except Exception as db_error:
-                    print(f" → ❌ DB Error: {str(db_error)[:100]}")
-            else:
-                print()
-            
-            all_data.append(df)
-            successful_seasons += 1
-            
-            # Respect rate limits
-            time.sleep(1)
-            
+            target_dir = os.path.join(ipc_root, os.path.relpath(dirpath, root))
+            os.makedirs(target_dir, exist_ok=True)
+            path = os.path.join(target_dir, filename[:-len('.parquet')] + '.arrow')
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            feather.write_feather(pq.read_table(os.path.join(dirpath, filename)), tmp_path,
+                                  compression='uncompressed')
+            os.replace(tmp_path, path)
+            written += 1
+    return written
+
+def load_season_totals(seasons=None, columns=None, players=None, stat_type='totals', root=None):
+    """
+    Read seasons from the local columnar dataset without loading all of it.
+    
+    Column projection and the season, stat type and player filters are
+    pushed down to the files: season filters prune whole partition
+    directories, and Parquet row-group statistics skip the rest. Files are
+    memory-mapped; an Arrow IPC dataset (see export_arrow_ipc) is read
+    zero-copy.
+    
+    Args:
+        seasons: Season labels ('2023-24') or end years (2024); None for all
+        columns: Columns to return (e.g. ['player', 'season', 'pts']); None for all
+        players: player_ids to keep; None for all
+        stat_type: Registered stat type to read (default: totals)
+        root: Dataset root; Parquet by default (PARQUET_CONFIG['root']), or
+            an Arrow IPC mirror such as PARQUET_CONFIG['ipc_root']
+    
+    Returns:
+        DataFrame with the requested rows and columns
+    """
+    if pa_ds is None:
+        raise RuntimeError("Reading the dataset needs pyarrow: pip install pyarrow")
+    root = root or PARQUET_CONFIG['root']
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"No dataset at {root}; run with --sink parquet first")
+    
+    file_format = 'parquet'
+    for _, _, filenames in os.walk(root):
+        if any(name.endswith('.arrow') for name in filenames):
+            file_format = 'ipc'
+            break
+    # Read every file against the registry, not against whichever file comes first:
+    # columns a season lacks come back as nulls instead of failing the scan
+    partition_schema = pa.schema([('season', pa.string()), ('stat_type', pa.string())])
+    schema = arrow_schema(SCHEMAS[stat_type])
+    for partition_field in partition_schema:
+        schema = schema.append(partition_field)
+    dataset = pa_ds.dataset(
+        root,
+        schema=schema,
+        format=file_format,
+        partitioning=pa_ds.partitioning(partition_schema, flavor='hive'),
+        filesystem=pa_fs.LocalFileSystem(use_mmap=True),
+        exclude_invalid_files=True,
+    )
+    
+    predicate = pa_ds.field('stat_type') == stat_type
+    if seasons is not None:
+        labels = [season if isinstance(season, str) else season_label(season) for season in seasons]
+        predicate = predicate & pa_ds.field('season').isin(labels)
+    if players is not None:
+        predicate = predicate & pa_ds.field('player_id').isin(list(players))
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name != 'stat_type']
+    
+    return dataset.to_table(columns=list(columns), filter=predicate).to_pandas()
+
+# Retry Configuration
+RETRY_CONFIG = {
+    # Attempts per stage of one page, including the first
+    'max_attempts': int(os.getenv('RETRY_MAX_ATTEMPTS', '4')),
+    # Full-jitter exponential backoff: sleep U(0, min(max_delay, base_delay * 2**attempt))
+    'base_delay': float(os.getenv('RETRY_BASE_DELAY', '1')),
+    'max_delay': float(os.getenv('RETRY_MAX_DELAY', '60')),
+    # Retries (in-stage and end-of-run re-queues) allowed per run, across all pages
+    'budget': int(os.getenv('RETRY_BUDGET', '30')),
+    # Extra passes over pages that still failed transiently at the end of the run
+    'requeue_passes': int(os.getenv('RETRY_REQUEUE_PASSES', '1')),
+}
+
+# Error kinds worth another attempt; the rest (4xx, parse, schema/DB errors, halted fetches) fail fast
+TRANSIENT_ERROR_KINDS = frozenset({'timeout', 'connection', 'throttled', 'server', 'db_connection'})
+
+class IngestionError(Exception):
+    """A season failure, tagged with the kind of error that caused it (see classify_error)."""
+
+    def __init__(self, message, kind='other'):
+        super().__init__(message)
+        self.kind = kind
+
+    @property
+    def transient(self):
+        return self.kind in TRANSIENT_ERROR_KINDS
+
+def classify_error(error, stage=None):
+    """
+    Sort an exception into an error kind.
+    
+    Returns:
+        'timeout', 'connection', 'throttled' (429), 'server' (5xx), 'client'
+        (other 4xx), 'halted' (Retry-After beyond the configured ceiling),
+        'parse', 'db_connection', 'db' or 'other'
+    """
+    if isinstance(error, IngestionError):
+        return error.kind
+    if isinstance(error, RetryAfterExceeded):
+        return 'halted'
+    status = None
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    elif aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+        status = error.status
+    if status is not None:
+        if status == 429:
+            return 'throttled'
+        return 'server' if status >= 500 else 'client'
+    if asyncpg is not None:
+        if isinstance(error, (asyncpg.PostgresConnectionError, asyncpg.InterfaceError)):
+            return 'db_connection'
+        if isinstance(error, asyncpg.PostgresError):
+            return 'db'
+    if isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError,
+                          sqlalchemy.exc.OperationalError, sqlalchemy.exc.DisconnectionError)):
+        return 'db_connection'
+    if isinstance(error, (psycopg2.Error, sqlalchemy.exc.SQLAlchemyError)):
+        return 'db'
+    if stage == 'load':
+        # A socket dropping or timing out underneath the database driver
+        return 'db_connection' if isinstance(error, (OSError, asyncio.TimeoutError)) else 'db'
+    if isinstance(error, (requests.exceptions.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return 'timeout'
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                          ConnectionError)):
+        return 'connection'
+    if aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return 'connection'
+    if isinstance(error, (RowAlignmentError, lxml.etree.LxmlError)) or stage == 'parse':
+        return 'parse'
+    return 'other'
+
+class RetryBudget:
+    """Thread-safe cap on the retries one run may spend, so an outage cannot stretch it indefinitely."""
+
+    def __init__(self, retries):
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        """Take one retry from the budget; False once it is exhausted."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff for the given attempt (1-based), never shorter than Retry-After."""
+    ceiling = min(RETRY_CONFIG['max_delay'], RETRY_CONFIG['base_delay'] * 2 ** attempt)
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+def _retry_delay(error, attempt, stage, retry_budget, job):
+    """
+    Seconds to wait before retrying `error`, or None if it should be raised.
+    
+    Raises RetryAfterExceeded instead when the server asked for a longer
+    wait than SCRAPER_CONFIG['max_retry_after'].
+    """
+    if classify_error(error, stage) not in TRANSIENT_ERROR_KINDS:
+        return None
+    # requests keeps the response on the error; aiohttp copies its headers over
+    response = getattr(error, 'response', None)
+    headers = response.headers if response is not None else getattr(error, 'headers', None)
+    retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+    if retry_after is not None and retry_after > SCRAPER_CONFIG['max_retry_after']:
+        raise RetryAfterExceeded(retry_after) from error
+    if (attempt >= RETRY_CONFIG['max_attempts']
+            or retry_budget is None or not retry_budget.try_spend()):
+        return None
+    job['retries'] = job.get('retries', 0) + 1
+    return backoff_delay(attempt, retry_after)
+
+def call_with_retries(fn, job, stage, retry_budget=None):
+    """
+    Call fn(), retrying transient errors with jittered exponential backoff.
+    
+    Retries count against `retry_budget` (none are made without one) and
+    are tallied in job['retries']. The last error is re-raised once the
+    attempts or the budget run out, or straight away if it is not transient.
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
         except Exception as e:
-            print(f"❌ Error: {e}")
-            failed_seasons.append(year)
-            time.sleep(3)  # Longer delay on error
-            continue
+            attempt += 1
+            delay = _retry_delay(e, attempt, stage, retry_budget, job)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+async def async_call_with_retries(fn, job, stage, retry_budget=None):
+    """Async counterpart of call_with_retries; fn is a zero-argument coroutine function."""
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            attempt += 1
+            delay = _retry_delay(e, attempt, stage, retry_budget, job)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+# Pipeline Configuration
+PIPELINE_CONFIG = {
+    # Pages held beyond the ones being fetched; once full, no new fetch starts
+    'queue_size': int(os.getenv('PIPELINE_QUEUE_SIZE', '4')),
+    # Parsing is CPU-bound, so extra threads mostly contend for the GIL
+    'parse_workers': int(os.getenv('PIPELINE_PARSE_WORKERS', '1')),
+    # Seasons written to the database at once by the async engine (replace loads stay serial)
+    'load_concurrency': int(os.getenv('PIPELINE_LOAD_CONCURRENCY', '2')),
+}
+
+def _parse_stage(job):
+    """Pipeline stage: parse the page into a DataFrame and drop the raw HTML."""
+    job['df'] = parse_season_page(job.pop('content'), job.get('stat_type', 'totals'))
+
+@functools.lru_cache(maxsize=64)
+def _column_mapping(headers, stat_type):
+    """
+    Compute (rename map, unmapped headers) for one header signature.
+    
+    Memoized: every season with the same headers reuses the same mapping.
+    """
+    table_schema = SCHEMAS[stat_type]
+    mapping = {}
+    unmapped = []
+    for header in headers:
+        spec = table_schema.resolve(header)
+        if spec is None:
+            # Fall back to the generic cleanup for headers the registry does not know
+            name = (header.lower()
+                    .replace('%', '_pct')
+                    .replace('3p', 'three_p')
+                    .replace('2p', 'two_p')
+                    .replace('-', '_'))
+            spec = table_schema.resolve(name)
+        if spec is None:
+            mapping[header] = name
+            unmapped.append(header)
+        else:
+            mapping[header] = spec.name
+    return mapping, tuple(unmapped)
+
+def normalize_columns(df, stat_type='totals'):
+    """
+    Rename a season frame's columns to its registered table columns, in place.
+    
+    Only the column labels are replaced; the data is not copied.
+    
+    Returns:
+        Tuple of source headers that have no column in the registered schema
+    """
+    mapping, unmapped = _column_mapping(tuple(df.columns), stat_type)
+    df.columns = [mapping[column] for column in df.columns]
+    return unmapped
+
+def _transform_stage(job):
+    """Pipeline stage: tag the season and rename it to table columns."""
+    df = job['df']
+    if df is None or df.empty:
+        return
+    
+    # Add season identifier
+    df["SEASON"] = pd.Categorical([season_label(job['year'])] * len(df))
+    job['content_hash'] = frame_content_hash(df)
+    job['unmapped'] = normalize_columns(df, job.get('stat_type', 'totals'))
+
+def _load_checkpoint(job, target, started):
+    """State and ledger statements that mark the job's season loaded, committed by the load itself."""
+    row_count = len(job['df'])
+    checkpoint = [season_loaded_statement(target['table_name'], season_label(job['year']), row_count)]
+    if target.get('run_id') is not None:
+        duration = sum(job.get('timings', {}).values()) + time.monotonic() - started
+        checkpoint.append(season_result_statement(target['run_id'], job['year'], 'loaded', row_count,
+                                                  job.get('content_hash'), duration))
+    return checkpoint
+
+def _load_stage(job, engine, targets, load_mode, retry_budget=None):
+    """Pipeline stage: write the season to its stat type's table and record it as loaded."""
+    df_db = job.get('df')
+    if df_db is None or df_db.empty:
+        return
+    target = targets[job['stat_type']]
+    table_name, table_schema = target['table_name'], target['schema']
+    partitioned = target.get('partitioned', False)
+    started = time.monotonic()
+    if load_mode == 'upsert':
+        df_db, job['unkeyed'] = drop_null_keys(df_db, table_schema)
+    
+    def load():
+        # The state and ledger rows commit with the rows, so an interrupted run never re-loads them on --resume
+        checkpoint = _load_checkpoint(job, target, started)
+        # Stream the season through COPY instead of multi-row INSERTs
+        if load_mode == 'replace':
+            return replace_season(engine, df_db, table_name, job['year'], table_schema,
+                                  partitioned=partitioned, checkpoint=checkpoint)
+        # Partitioned tables are written straight into the season's partition
+        load_table = ensure_season_partition(engine, table_name, job['year']) if partitioned else table_name
+        if load_mode == 'upsert':
+            return upsert_dataframe(engine, df_db, load_table, table_schema, checkpoint=checkpoint)
+        return copy_dataframe_to_table(engine, df_db, load_table, table_schema, checkpoint=checkpoint)
+    
+    # Each load commits or rolls back as a whole, checkpoints included, so neither
+    # a retry nor an end-of-run re-queue can follow a committed load and double its rows
+    changed, skipped = call_with_retries(load, job, 'load', retry_budget)
+    job['loaded'] = (changed, skipped)
+
+def _parquet_stage(job, root):
+    """Pipeline stage: write the season to the Parquet dataset."""
+    df = job.get('df')
+    if df is None or df.empty:
+        return
+    job['parquet_path'] = write_season_parquet(df, job['year'], job['stat_type'], root)
+
+def _new_summary():
+    """Running totals for the end-of-run report, updated one season at a time."""
+    return {'seasons': [], 'records': 0, 'players': set(), 'teams': set()}
+
+def _update_summary(summary, df):
+    """Fold one season into the running summary."""
+    summary['seasons'].append(df['season'].iloc[0])
+    summary['records'] += len(df)
+    summary['players'].update(df['player'].dropna().unique())
+    if 'team' in df.columns:
+        summary['teams'].update(df['team'].dropna().unique())
+
+async def _async_fetch_stage(job, session, retry_budget=None):
+    """Async stage: download the season page, over aiohttp when a session is given."""
+    year, stat_type = job['year'], job.get('stat_type', 'totals')
+    
+    async def fetch():
+        try:
+            if session is None:
+                return await asyncio.to_thread(fetch_season_page, year, stat_type)
+            return await async_fetch_page(session, season_page_url(year, stat_type),
+                                          frozen=year < current_season_end_year())
+        except Exception:
+            # Back every worker off, not just this one
+            RATE_LIMITER.pause(SCRAPER_CONFIG['error_pause'])
+            raise
+    
+    job['content'] = await async_call_with_retries(fetch, job, 'fetch', retry_budget)
+
+async def _async_load_stage(job, pool, engine, targets, load_mode, retry_budget=None):
+    """Async stage: COPY/merge the season through asyncpg, or the sync loader on a worker thread."""
+    df_db = job.get('df')
+    if df_db is None or df_db.empty:
+        return
+    if pool is None or load_mode == 'replace':
+        # Shadow swaps are a handful of DDL statements; they stay on the pooled sync engine
+        await asyncio.to_thread(_load_stage, job, engine, targets, load_mode, retry_budget)
+        return
+    target = targets[job['stat_type']]
+    table_name, table_schema = target['table_name'], target['schema']
+    started = time.monotonic()
+    if load_mode == 'upsert':
+        df_db, job['unkeyed'] = drop_null_keys(df_db, table_schema)
+    
+    async def load():
+        checkpoint = _load_checkpoint(job, target, started)
+        load_table = table_name
+        if target.get('partitioned', False):
+            load_table = await asyncio.to_thread(ensure_season_partition, engine, table_name, job['year'])
+        if load_mode == 'upsert':
+            return await async_upsert_dataframe(pool, df_db, load_table, table_schema, checkpoint=checkpoint)
+        return await async_copy_dataframe_to_table(pool, df_db, load_table, table_schema, checkpoint=checkpoint)
+    
+    changed, skipped = await async_call_with_retries(load, job, 'load', retry_budget)
+    job['loaded'] = (changed, skipped)
+
+def _record_page_outcome(job, engine, targets):
+    """
+    Checkpoint a page that did not load: 'failed' with its error, or 'empty'.
+    
+    Loaded pages are checkpointed by the load's own transaction (see _load_stage).
+    """
+    run_id = targets[job['stat_type']]['run_id']
+    if run_id is None or 'loaded' in job:
+        return
+    year, df, error = job['year'], job.get('df'), job.get('error')
+    duration = sum(job.get('timings', {}).values())
+    if error is not None:
+        record_season_result(engine, run_id, year, 'failed', duration=duration, error=error)
+    elif df is None or df.empty:
+        record_season_result(engine, run_id, year, 'empty', 0, duration=duration)
+
+def _report_page(job, targets, load_mode, summary, failed_pages, all_data=None, requeue=None):
+    """
+    Print one finished page and fold it into `summary`.
+    
+    Failed pages go to `failed_pages`, and also to `requeue` (if given) when
+    their error is transient.
+    """
+    show_stat_type = len(targets) > 1
+    year, stat_type, df, error = job['year'], job['stat_type'], job.get('df'), job.get('error')
+    page = f"{year-1}-{year} {stat_type}" if show_stat_type else f"{year-1}-{year} season"
+    print(f"📊 {page}... ", end="", flush=True)
+    retried = f" after {job['retries']} retr{'y' if job['retries'] == 1 else 'ies'}" if job.get('retries') else ""
+    
+    if error is not None:
+        kind = classify_error(error, job.get('failed_stage'))
+        if requeue is not None and kind in TRANSIENT_ERROR_KINDS:
+            requeue.append((year, stat_type))
+    
+    if error is not None and job.get('failed_stage') not in ('parquet', 'load'):
+        print(f"❌ Error ({kind}{retried}): {error}")
+        failed_pages.append((year, stat_type))
+        return
+    
+    if df is None or df.empty:
+        print(f"⚠️  No data returned for {year}")
+        failed_pages.append((year, stat_type))
+        return
+    
+    print(f"✅ {len(df):,} players", end="")
+    row_issues = df.attrs.get('row_issues', [])
+    if row_issues:
+        row_number, reason, label = row_issues[0]
+        print(f" ⚠️  {len(row_issues)} unaligned row(s), e.g. row {row_number} ({label}): {reason}", end="")
+    
+    if error is not None:
+        sink = 'Parquet' if job['failed_stage'] == 'parquet' else 'DB'
+        print(f" → ❌ {sink} Error ({kind}{retried}): {str(error)[:100]}")
+        failed_pages.append((year, stat_type))
+        return
+    
+    if 'parquet_path' in job:
+        print(f" → 🗂️  Parquet", end="")
+    if 'loaded' in job:
+        changed, _ = job['loaded']
+        if load_mode == 'upsert':
+            print(f" → 💾 Upserted {changed:,} changed rows", end="")
+            if job.get('unkeyed'):
+                key = '/'.join(targets[stat_type]['schema'].natural_key)
+                print(f" (⚠️  {job['unkeyed']} row(s) with no {key} left out)", end="")
+        elif load_mode == 'replace':
+            print(f" → 💾 Replaced season", end="")
+        else:
+            print(f" → 💾 Saved to DB", end="")
+    if job.get('unmapped'):
+        print(f" (⚠️  no table column for: {', '.join(job['unmapped'])})", end="")
+    if retried:
+        print(f" (🔁{retried})", end="")
+    print()
+    
+    _update_summary(summary, df)
+    if all_data is not None:
+        all_data.setdefault(stat_type, []).append(df)
+
+async def _async_ingest_seasons(jobs, max_workers, save_to_db, engine, targets, load_mode,
+                                summary, failed_pages, all_data=None, parquet_root=None,
+                                retry_budget=None, requeue=None, session=None, pool=None):
+    """
+    Run each (season, stat type) page through fetch → parse → transform → load on one event loop.
+    
+    Up to `max_workers` fetches are in flight at once, all sharing the HTTP
+    session, cache and rate limiter. Parsing and transforming run on worker
+    threads (PIPELINE_CONFIG['parse_workers'] at a time), and up to
+    PIPELINE_CONFIG['load_concurrency'] seasons are written at once. Only
+    max_workers + PIPELINE_CONFIG['queue_size'] pages are held in memory.
+    Each frame is written to the Parquet dataset under `parquet_root` (if
+    given) and/or the database, reported through _report_page and released
+    unless `all_data` (a dict of lists keyed by stat type) is given.
+    
+    Transient fetch and load errors are retried in place against
+    `retry_budget`; pages that still fail transiently are also appended to
+    `requeue` (if given) so the caller can try them again at the end.
+    """
+    fetch_slots = asyncio.Semaphore(max(1, max_workers))
+    cpu_slots = asyncio.Semaphore(max(1, PIPELINE_CONFIG['parse_workers']))
+    load_slots = asyncio.Semaphore(1 if load_mode == 'replace' else max(1, PIPELINE_CONFIG['load_concurrency']))
+    in_flight = asyncio.Semaphore(max(1, max_workers) + max(1, PIPELINE_CONFIG['queue_size']))
+    
+    def threaded(fn):
+        return lambda job: asyncio.to_thread(fn, job)
+    
+    # (name, coroutine function, semaphore bounding it or None)
+    stages = [
+        ('fetch', lambda job: _async_fetch_stage(job, session, retry_budget), fetch_slots),
+        ('parse', threaded(_parse_stage), cpu_slots),
+        ('transform', threaded(_transform_stage), cpu_slots),
+    ]
+    if parquet_root is not None:
+        stages.append(('parquet', threaded(functools.partial(_parquet_stage, root=parquet_root)), None))
+    if save_to_db and engine is not None:
+        stages.append(('load', lambda job: _async_load_stage(
+            job, pool, engine, targets, load_mode, retry_budget,
+        ), load_slots))
+    
+    finished = asyncio.Queue()
+    
+    async def process(job):
+        try:
+            # A failed stage records its error and skips the rest
+            for name, fn, slots in stages:
+                async with slots or contextlib.nullcontext():
+                    started = time.monotonic()
+                    try:
+                        await fn(job)
+                    except Exception as e:
+                        job['error'] = e
+                        job['failed_stage'] = name
+                    job.setdefault('timings', {})[name] = time.monotonic() - started
+                if job.get('error') is not None:
+                    break
+        finally:
+            # The slot is freed once the page has been reported (below), not here, so
+            # frames waiting to be reported still count against the in-flight bound
+            finished.put_nowait(job)
+    
+    tasks = []
+    
+    async def feed():
+        for job in jobs:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(process(job)))
+    
+    feeder = asyncio.create_task(feed())
+    try:
+        for _ in range(len(jobs)):
+            job = await finished.get()
+            if engine is not None:
+                # The ledger write is a blocking round-trip; keep it off the loop
+                await asyncio.to_thread(_record_page_outcome, job, engine, targets)
+            _report_page(job, targets, load_mode, summary, failed_pages, all_data, requeue)
+            # The caller's job list outlives the run; drop the frame from it
+            job.pop('df', None)
+            in_flight.release()
+    finally:
+        feeder.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(feeder, *tasks, return_exceptions=True)
+
+LOAD_MODES = ('append', 'upsert', 'replace')
+
+def _prepare_run(targets, start_year, end_year, save_to_db, load_mode, incremental, resume, partitioned):
+    """
+    Bootstrap the tables and plan each target's seasons and ledger run.
+    
+    Blocking database work done once, before any page is fetched; `targets`
+    is updated in place.
+    
+    Returns:
+        (engine, save_to_db, load_mode, incremental), adjusted for what the
+        database allowed
+    """
+    engine = None
+    if save_to_db:
+        engine = get_db_connection()
+        if engine is None:
+            print("⚠️  Could not connect to database. Proceeding without saving to DB.")
+            save_to_db = False
+            # Planning and resuming need the table's load history and ledger
+            incremental = False
+            resume = False
+        else:
+            for stat_type, target in targets.items():
+                layout = prepare_table(engine, target['table_name'], stat_type, partitioned)
+                target['partitioned'] = layout is not None and layout['partitioned']
+                if partitioned and not target['partitioned']:
+                    print(f"⚠️  nba.{target['table_name']} already exists unpartitioned; loading it as is.")
+            bootstrap_once(('ingestion_state',), lambda: create_ingestion_state_table(engine))
+            bootstrap_once(('ledger',), lambda: create_ledger_tables(engine))
+    
+    if resume:
+        for target in targets.values():
+            run = find_resumable_run(engine, target['table_name'])
+            if run is None:
+                print(f"ℹ️  No unfinished run for nba.{target['table_name']}. Starting a fresh run.")
+                continue
+            target['run_id'] = run['run_id']
+            target['years'] = run['years']
+            load_mode = run['load_mode']
+            print(f"⏯️  Resuming run #{run['run_id']} for nba.{target['table_name']}: "
+                  f"{len(run['done_years'])} season(s) already loaded")
+    
+    if save_to_db and load_mode == 'upsert':
+        if not all(bootstrap_once(('upsert_index', target['table_name']),
+                                  lambda: create_upsert_index(engine, target['table_name'], target['schema']))
+                   for target in targets.values()):
+            print("⚠️  Could not prepare upsert index. Proceeding without saving to DB.")
+            save_to_db = False
+            incremental = False
+            for target in targets.values():
+                target['run_id'] = None
+    
+    if incremental:
+        for target in targets.values():
+            if target['years']:
+                planned = set(plan_seasons(engine, target['table_name'],
+                                           min(target['years']), max(target['years'])))
+                target['years'] = [year for year in target['years'] if year in planned]
+    
+    if save_to_db:
+        for target in targets.values():
+            if target['run_id'] is None:
+                target['run_id'] = start_run(engine, target['table_name'], start_year, end_year, load_mode,
+                                             target['years'])
+    
+    return engine, save_to_db, load_mode, incremental
+
+# Process-wide event loop behind get_all_seasons, so its aiohttp session and
+# asyncpg pool outlive a single run the way the shared requests session and
+# SQLAlchemy engine do
+_ingestion_loop = None
+_ingestion_loop_lock = threading.Lock()
+_async_clients = {}
+
+def _get_ingestion_loop():
+    """Return the background event loop get_all_seasons runs on, starting it on first use."""
+    global _ingestion_loop
+    with _ingestion_loop_lock:
+        if _ingestion_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='ingestion-loop', daemon=True).start()
+            _ingestion_loop = loop
+    return _ingestion_loop
+
+def _on_ingestion_loop():
+    try:
+        return asyncio.get_running_loop() is _ingestion_loop
+    except RuntimeError:
+        return False
+
+async def _shared_async_clients(save_to_db):
+    """
+    Return (aiohttp session, asyncpg pool) kept open across runs on the ingestion loop.
+    
+    Either is None when its package is missing; the pool is also None when
+    save_to_db is off or it could not be opened (then it is retried next run).
+    """
+    lock = _async_clients.setdefault('lock', asyncio.Lock())
+    async with lock:
+        session = _async_clients.get('session')
+        if aiohttp is not None and (session is None or session.closed):
+            session = _async_clients['session'] = new_async_http_session()
+        pool = _async_clients.get('pool')
+        if save_to_db and pool is None:
+            pool = _async_clients['pool'] = await create_async_db_pool()
+    return session, pool if save_to_db else None
+
+async def _close_async_clients():
+    session, pool = _async_clients.pop('session', None), _async_clients.pop('pool', None)
+    if session is not None:
+        await session.close()
+    if pool is not None:
+        await pool.close()
+
+def close_async_clients():
+    """Close the aiohttp session and asyncpg pool shared by get_all_seasons runs (also done at exit)."""
+    if _ingestion_loop is not None and _async_clients:
+        asyncio.run_coroutine_threadsafe(_close_async_clients(), _ingestion_loop).result()
+
+atexit.register(close_async_clients)
+
+async def async_get_all_seasons(start_year=1950, end_year=2025, save_to_db=True, table_name="player_season_totals",
+                                max_workers=SCRAPER_CONFIG['max_workers'], load_mode='append', incremental=False,
+                                resume=False, return_df=False, stat_types=('totals',), partitioned=False,
+                                bulk=False, concurrent_indexes=False, sink='postgres'):
+    """
+    Fetch all NBA player season stats using Basketball Reference Scraper, on one event loop.
+    
+    Page fetches go through aiohttp and append/upsert loads through an
+    asyncpg pool, multiplexed with bounded concurrency (see
+    _async_ingest_seasons). Run through get_all_seasons, the session and
+    pool are shared with later runs; awaited on another loop, each run
+    opens and closes its own. Without those packages the same stages run the
+    requests/psycopg2 code on worker threads. Table bootstrap, ledger
+    bookkeeping and shadow-partition swaps always use the pooled SQLAlchemy
+    engine on worker threads.
+    
+    Args:
+        start_year: First season end year to fetch (default: 1950)
+        end_year: Last season end year to fetch (default: 2025)
+        save_to_db: Whether to save data to PostgreSQL (default: True)
+        table_name: Name of the totals table (default: player_season_totals);
+            other stat types load into their registered tables
+        max_workers: Number of pages fetched concurrently; all fetches share
+            RATE_LIMITER, so this overlaps latency without raising the request rate
+        load_mode: 'append' to COPY rows straight in, 'upsert' to merge on
+            (player_id, season, team) so re-runs do not duplicate rows, or
+            'replace' to swap each fetched season in whole
+        incremental: Only fetch seasons that are missing, in progress or stale
+            in the table (append runs switch to load_mode='upsert')
+        resume: Continue the last unfinished run for each table, skipping the
+            seasons its ledger already marks as loaded
+        return_df: Keep every season in memory and return them concatenated;
+            otherwise each season is released as soon as it is loaded
+        stat_types: Registered stat types to ingest (see SCHEMAS), e.g.
+            ('totals', 'per_game', 'advanced')
+        partitioned: Create new tables LIST-partitioned by season; each
+            season is then loaded straight into its own partition
+        bulk: Drop the secondary indexes before loading and rebuild them
+            (plus ANALYZE) once at the end, instead of maintaining them row
+            by row; meant for large backfills
+        concurrent_indexes: Rebuild bulk-mode indexes with CREATE INDEX
+            CONCURRENTLY so the tables stay writable meanwhile
+        sink: 'postgres', 'parquet' (a Hive-partitioned dataset under
+            PARQUET_CONFIG['root']) or 'both'; save_to_db=False turns the
+            PostgreSQL side off either way
+    
+    Returns:
+        If return_df, a DataFrame of all fetched seasons (table column names),
+        or a dict of DataFrames keyed by stat type when several stat types are
+        requested; otherwise None
+    """
+    if load_mode not in LOAD_MODES:
+        raise ValueError(f"load_mode must be one of {LOAD_MODES}, got {load_mode!r}")
+    if sink not in SINKS:
+        raise ValueError(f"sink must be one of {SINKS}, got {sink!r}")
+    write_parquet = sink in ('parquet', 'both')
+    if write_parquet and pq is None:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+    save_to_db = save_to_db and sink in ('postgres', 'both')
+    stat_types = tuple(stat_types)
+    unknown = [stat_type for stat_type in stat_types if stat_type not in SCHEMAS]
+    if unknown or not stat_types:
+        raise ValueError(f"stat_types must be a non-empty subset of {sorted(SCHEMAS)}, got {list(stat_types)}")
+    if incremental and not save_to_db:
+        print("⚠️  Incremental mode needs the database. Fetching the full range.")
+        incremental = False
+    if resume and not save_to_db:
+        print("⚠️  Resume needs the database ledger. Starting a fresh run.")
+        resume = False
+    if incremental and load_mode == 'append':
+        # In-progress seasons are reloaded, which must not duplicate their rows
+        load_mode = 'upsert'
+    
+    # One target table, season plan and ledger run per stat type
+    targets = {}
+    for stat_type in stat_types:
+        table_schema = SCHEMAS[stat_type]
+        targets[stat_type] = {
+            'schema': table_schema,
+            'table_name': table_name if stat_type == 'totals' else table_schema.table_name,
+            # Seasons before the stat type's page exists would only ever 404
+            'years': list(range(max(start_year, table_schema.first_season), end_year + 1)),
+            'run_id': None,
+            'partitioned': False,
+        }
+    
+    engine, save_to_db, load_mode, incremental = await asyncio.to_thread(
+        _prepare_run, targets, start_year, end_year, save_to_db, load_mode, incremental, resume, partitioned,
+    )
+    
+    # Interleave stat types so all pages for one season are fetched together
+    jobs = [
+        {'year': year, 'stat_type': stat_type}
+        for year in sorted({year for target in targets.values() for year in target['years']})
+        for stat_type in stat_types
+        if year in targets[stat_type]['years']
+    ]
+    
+    print(f"\n🏀 NBA Season Stats Ingestion - Basketball Reference Scraper")
+    print(f"📅 Season range: {start_year-1}-{start_year} to {end_year-1}-{end_year}")
+    print(f"📈 Stat types: {', '.join(stat_types)}")
+    if incremental:
+        for stat_type, target in targets.items():
+            years = target['years']
+            print(f"🔁 Incremental ({stat_type}): {len(years)} missing or stale of {end_year - start_year + 1} seasons"
+                  + (f" ({', '.join(season_label(year) for year in years)})" if 0 < len(years) <= 10 else ""))
+    else:
+        print(f"📊 Total pages: {len(jobs)}")
+    tables = ', '.join(f"nba.{target['table_name']}" for target in targets.values())
+    if save_to_db:
+        print(f"💾 Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+        print(f"📋 Tables: {tables} ({load_mode})")
+    if write_parquet:
+        print(f"🗂️  Parquet dataset: {PARQUET_CONFIG['root']}")
+    print(f"⚡ Workers: {max_workers} (shared adaptive limit: {RATE_LIMITER.rate:.2f} req/s, "
+          f"{RATE_LIMITER.min_rate:g}-{RATE_LIMITER.max_rate:g})")
+    print(f"⏱️  Estimated time: ~{len(jobs) / RATE_LIMITER.rate:.0f} seconds (with rate limiting)\n")
     
+    def finish_runs(status_for):
+        for stat_type, target in targets.items():
+            if target['run_id'] is not None:
+                finish_run(engine, target['run_id'], status_for(stat_type))
+    
+    if not jobs:
+        print("✅ Every season is already up to date!")
+        await asyncio.to_thread(finish_runs, lambda stat_type: 'completed')
+        return pd.DataFrame() if return_df else None
+    
+    if save_to_db and bulk:
+        for stat_type, target in targets.items():
+            if target['years']:
+                target['indexes_dropped'] = await asyncio.to_thread(
+                    drop_secondary_indexes, engine, target['table_name'], target['schema'],
+                )
+    
+    summary = _new_summary()
+    failed_pages = []
+    all_data = {} if return_df else None
+    retry_budget = RetryBudget(RETRY_CONFIG['budget'])
+    shared_clients = _on_ingestion_loop()
+    if shared_clients:
+        session, pool = await _shared_async_clients(save_to_db)
+    else:
+        session = new_async_http_session() if aiohttp is not None else None
+        pool = await create_async_db_pool() if save_to_db else None
+    
+    async def ingest(page_jobs, requeue):
+        await _async_ingest_seasons(page_jobs, max_workers, save_to_db, engine, targets, load_mode,
+                                    summary, failed_pages, all_data,
+                                    parquet_root=PARQUET_CONFIG['root'] if write_parquet else None,
+                                    retry_budget=retry_budget, requeue=requeue, session=session, pool=pool)
+    
+    try:
+        requeue = []
+        await ingest(jobs, requeue)
+        # Give pages that hit a transient blip one more go once everything else is done
+        for _ in range(RETRY_CONFIG['requeue_passes']):
+            retry_pages = [page for page in requeue if retry_budget.try_spend()]
+            if not retry_pages:
+                break
+            print(f"\n🔁 Re-queuing {len(retry_pages)} page(s) that failed with transient errors "
+                  f"({retry_budget.remaining} retries left)")
+            for page in retry_pages:
+                failed_pages.remove(page)
+            requeue = []
+            await ingest([{'year': year, 'stat_type': stat_type} for year, stat_type in retry_pages], requeue)
+    except BaseException:
+        # Leave the runs resumable; seasons already checkpointed stay done
+        await asyncio.to_thread(finish_runs, lambda stat_type: 'interrupted')
+        raise
+    finally:
+        if not shared_clients:
+            if session is not None:
+                await session.close()
+            if pool is not None:
+                await pool.close()
+        RATE_LIMITER.save_state()
+        # Never leave a table without its indexes, even after a failed run
+        for target in targets.values():
+            if target.get('indexes_dropped'):
+                await asyncio.to_thread(
+                    build_secondary_indexes, engine, target['table_name'], target['schema'],
+                    partitioned=target['partitioned'], concurrently=concurrent_indexes,
+                )
+    failed_types = {stat_type for _, stat_type in failed_pages}
+    await asyncio.to_thread(finish_runs, lambda stat_type: 'failed' if stat_type in failed_types else 'completed')
+            
     # Compile results
-    if all_data:
-        full_df = pd.concat(all_data, ignore_index=True)
-        
+    if summary['seasons']:
         print(f"\n{'='*60}")
         print(f"🎉 INGESTION COMPLETE!")
         print(f"{'='*60}")
-        print(f"✅ Successful seasons: {successful_seasons}/{end_year - start_year + 1}")
-        if failed_seasons:
-            print(f"❌ Failed seasons: {failed_seasons}")
-        print(f"📊 Total records: {len(full_df):,}")
-        print(f"👥 Unique players: {full_df['Player'].nunique():,}")
-        print(f"🏟️  Unique teams: {full_df['Tm'].nunique()}")
-        print(f"📅 Seasons: {full_df['SEASON'].min()} to {full_df['SEASON'].max()}")
+        print(f"✅ Successful pages: {len(summary['seasons'])}/{len(jobs)}")
+        if failed_pages:
+            if len(stat_types) == 1:
+                print(f"❌ Failed seasons: {[year for year, _ in failed_pages]}")
+            else:
+                print(f"❌ Failed pages: {[f'{year} {stat_type}' for year, stat_type in failed_pages]}")
+        print(f"📊 Total records: {summary['records']:,}")
+        print(f"👥 Unique players: {len(summary['players']):,}")
+        print(f"🏟️  Unique teams: {len(summary['teams'])}")
+        print(f"📅 Seasons: {min(summary['seasons'])} to {max(summary['seasons'])}")
         
         if save_to_db:
-            print(f"💾 Data saved to: nba.{table_name}")
+            print(f"💾 Data saved to: {tables}")
+        if write_parquet:
+            print(f"🗂️  Parquet written to: {PARQUET_CONFIG['root']}")
         
         print(f"{'='*60}\n")
         
-        return full_df
+        if return_df:
+            frames = {stat_type: pd.concat(all_data[stat_type], ignore_index=True)
+                      for stat_type in stat_types if all_data.get(stat_type)}
+            if len(stat_types) == 1:
+                return frames.get(stat_types[0], pd.DataFrame())
+            return frames
+        return None
     else:
         print("\n❌ No data fetched!")
-        return pd.DataFrame()
+        return pd.DataFrame() if return_df else None
 
-def main():
+def get_all_seasons(start_year=1950, end_year=2025, save_to_db=True, table_name="player_season_totals",
+                    max_workers=SCRAPER_CONFIG['max_workers'], load_mode='append', incremental=False,
+                    resume=False, return_df=False, stat_types=('totals',), partitioned=False,
+                    bulk=False, concurrent_indexes=False, sink='postgres'):
+    """
+    Blocking wrapper around async_get_all_seasons; takes and returns the same values.
+    
+    Runs the ingestion on a process-wide background event loop that keeps
+    its aiohttp session and asyncpg pool open between calls, so a scheduler
+    calling this repeatedly reuses warm connections. Works the same whether
+    or not the caller already has a loop running (e.g. a notebook).
+    """
+    ingestion = async_get_all_seasons(
+        start_year=start_year, end_year=end_year, save_to_db=save_to_db, table_name=table_name,
+        max_workers=max_workers, load_mode=load_mode, incremental=incremental, resume=resume,
+        return_df=return_df, stat_types=stat_types, partitioned=partitioned, bulk=bulk,
+        concurrent_indexes=concurrent_indexes, sink=sink,
+    )
+    loop = _get_ingestion_loop()
+    tasks, finished = [], threading.Event()
+    
+    async def run():
+        tasks.append(asyncio.current_task())
+        try:
+            return await ingestion
+        finally:
+            finished.set()
+    
+    future = asyncio.run_coroutine_threadsafe(run(), loop)
+    try:
+        # Wait in short slices: a bare result() would hold off Ctrl-C until the run ends
+        while True:
+            with contextlib.suppress(concurrent.futures.TimeoutError):
+                return future.result(timeout=0.5)
+    except BaseException:
+        # e.g. Ctrl-C in the caller: stop the run and let it mark itself interrupted
+        if tasks:
+            loop.call_soon_threadsafe(tasks[0].cancel)
+            finished.wait()
+        else:
+            future.cancel()
+        raise
+
+def parse_args(argv=None):
+    """Parse command line options for the ingestion run."""
+    parser = argparse.ArgumentParser(description="NBA Season Totals Ingestion Pipeline")
+    parser.add_argument('--start-year', type=int, default=1950,
+                        help="First season end year to fetch (1950 is first available year)")
+    parser.add_argument('--end-year', type=int, default=2025,
+                        help="Last season end year to fetch")
+    parser.add_argument('--table', default="player_season_totals",
+                        help="Target table in the nba schema")
+    parser.add_argument('--no-db', action='store_true',
+                        help="Only fetch; do not save to PostgreSQL")
+    parser.add_argument('--sink', choices=SINKS, default='postgres',
+                        help="Write to PostgreSQL, a local Parquet dataset, or both")
+    parser.add_argument('--workers', type=int, default=SCRAPER_CONFIG['max_workers'],
+                        help="Seasons fetched concurrently (shares one rate limit)")
+    parser.add_argument('--load-mode', choices=LOAD_MODES, default='append',
+                        help="append rows, upsert on (player_id, season, team) (rows missing one are "
+                             "left out), or replace whole seasons")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch seasons missing, in progress or stale in the database")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the last unfinished run, skipping seasons it already loaded")
+    parser.add_argument('--stat-types', nargs='+', choices=sorted(SCHEMAS), default=['totals'],
+                        help="Stat types to ingest; each loads into its own table")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Create new tables partitioned by season")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Drop secondary indexes during the load and rebuild them at the end")
+    parser.add_argument('--concurrent-indexes', action='store_true',
+                        help="Rebuild bulk-mode indexes with CREATE INDEX CONCURRENTLY")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
+    
     print("🏀 NBA Season Totals Ingestion Pipeline")
     print("📚 Using Basketball Reference Scraper")
     print(f"{'='*60}\n")
     
-    # Configuration
-    START_YEAR = 1950  # Change this to fetch different range (1950 is first available year)
-    END_YEAR = 2025
-    SAVE_TO_DB = True  # Save to PostgreSQL database
-    TABLE_NAME = "player_season_totals"
-    
     # Fetch all seasons and save directly to database
     df = get_all_seasons(
-        start_year=START_YEAR,
-        end_year=END_YEAR,
-        save_to_db=SAVE_TO_DB,
-        table_name=TABLE_NAME
+        start_year=args.start_year,
+        end_year=args.end_year,
+        save_to_db=not args.no_db,
+        table_name=args.table,
+        max_workers=args.workers,
+        load_mode=args.load_mode,
+        incremental=args.incremental,
+        resume=args.resume,
+        # Without a database or Parquet files the returned frame is the only output
+        return_df=args.no_db and args.sink == 'postgres',
+        stat_types=args.stat_types,
+        partitioned=args.partitioned,
+        bulk=args.bulk,
+        concurrent_indexes=args.concurrent_indexes,
+        sink=args.sink
     )
     
     # Display sample data
-    if not df.empty:
-        print("\n📋 Sample Data (first 5 records):")
-        print(df.head())
-        print(f"\n📊 DataFrame shape: {df.shape}")
-        print(f"\n📝 Columns: {list(df.columns)}")
+    frames = df if isinstance(df, dict) else {args.stat_types[0]: df}
+    for stat_type, frame in frames.items():
+        if frame is not None and not frame.empty:
+            print(f"\n📋 Sample {stat_type} data (first 5 records):")
+            print(frame.head())
+            print(f"\n📊 DataFrame shape: {frame.shape}")
+            print(f"\n📝 Columns: {list(frame.columns)}")
     
     return df
 
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+import requests
+
+# The pipeline is a single module at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def totals_page():
+    """A trimmed 2023-24 totals page: group header, repeated header row, gaps and a commented table."""
+    with open(os.path.join(FIXTURES, 'totals_page.html'), 'rb') as f:
+        return f.read()
+
+
+def http_error(status, headers=None):
+    """An HTTPError carrying a response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
@@ -0,0 +1,152 @@
+import os
+
+import pytest
+
+import nba_api_ingestion as ingestion
+
+URL = 'https://www.basketball-reference.com/leagues/NBA_2024_totals.html'
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'enabled', True)
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'dir', str(tmp_path))
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'max_bytes', 10 * 1024 * 1024)
+    return tmp_path
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ingestion.requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeSession:
+    """Stands in for the shared requests session, replaying canned responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(ingestion, 'get_http_session', lambda: fake)
+    monkeypatch.setattr(ingestion, 'RATE_LIMITER', ingestion.AdaptiveRateLimiter(1000, 10, max_rate=1000))
+    return fake
+
+
+def blob_count(cache_dir):
+    return len([name for name in os.listdir(cache_dir / 'blobs') if name.endswith('.html')])
+
+
+def test_store_and_lookup_round_trip():
+    ingestion.cache_store(URL, b'<html>totals</html>', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+
+    meta, body = ingestion.cache_lookup(URL)
+    assert body == b'<html>totals</html>'
+    assert meta['etag'] == '"v1"'
+    assert meta['last_modified'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    assert meta['frozen'] is False
+
+
+def test_lookup_misses_unknown_urls():
+    assert ingestion.cache_lookup(URL) == (None, None)
+
+
+def test_identical_bodies_share_one_blob(cache_dir):
+    ingestion.cache_store(URL, b'<html>same</html>')
+    ingestion.cache_store(URL.replace('totals', 'per_game'), b'<html>same</html>')
+
+    assert blob_count(cache_dir) == 1
+
+
+def test_disabled_cache_stores_nothing(monkeypatch):
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'enabled', False)
+    ingestion.cache_store(URL, b'<html>totals</html>')
+
+    assert ingestion.cache_lookup(URL) == (None, None)
+
+
+def test_304_reuses_the_cached_body(session):
+    ingestion.cache_store(URL, b'<html>cached</html>', etag='"v1"')
+    session.responses.append(FakeResponse(304))
+
+    assert ingestion.fetch_page(URL) == b'<html>cached</html>'
+    _, headers = session.requests[0]
+    assert headers['If-None-Match'] == '"v1"'
+
+
+def test_changed_page_replaces_the_cached_copy(session):
+    ingestion.cache_store(URL, b'<html>old</html>', etag='"v1"')
+    session.responses.append(FakeResponse(200, b'<html>new</html>', {'ETag': '"v2"'}))
+
+    assert ingestion.fetch_page(URL) == b'<html>new</html>'
+    meta, body = ingestion.cache_lookup(URL)
+    assert body == b'<html>new</html>'
+    assert meta['etag'] == '"v2"'
+
+
+def test_frozen_pages_are_served_without_a_request(session):
+    ingestion.cache_store(URL, b'<html>1990</html>', frozen=True)
+
+    assert ingestion.fetch_page(URL, frozen=True) == b'<html>1990</html>'
+    assert session.requests == []
+
+
+def test_revalidated_finished_season_is_frozen(session):
+    ingestion.cache_store(URL, b'<html>final</html>', etag='"v1"')
+    session.responses.append(FakeResponse(304))
+
+    ingestion.fetch_page(URL, frozen=True)
+    meta, _ = ingestion.cache_lookup(URL)
+    assert meta['frozen'] is True
+
+
+def test_eviction_drops_least_recently_used_entries(monkeypatch):
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'max_bytes', 3500)
+    urls = [URL.replace('2024', str(year)) for year in (2001, 2002, 2003)]
+    for index, url in enumerate(urls):
+        ingestion.cache_store(url, bytes([index]) * 1000)
+        # Distinct mtimes, oldest first
+        meta_path, _ = ingestion._cache_paths(url)
+        os.utime(meta_path, (index, index))
+
+    ingestion.cache_store(URL, b'x' * 1000)
+
+    assert ingestion.cache_lookup(urls[0]) == (None, None)
+    assert ingestion.cache_lookup(urls[1])[1] is not None
+    assert ingestion.cache_lookup(URL)[1] is not None
+
+
+def test_old_versions_of_a_changing_page_do_not_evict_live_entries(cache_dir, monkeypatch):
+    monkeypatch.setitem(ingestion.HTML_CACHE_CONFIG, 'max_bytes', 3000)
+    frozen_url = URL.replace('2024', '1990')
+    ingestion.cache_store(frozen_url, b'f' * 1000, frozen=True)
+    # The current season changes daily; each version leaves its previous blob unreferenced
+    for version in range(5):
+        ingestion.cache_store(URL, bytes([version]) * 1000)
+
+    assert ingestion.cache_lookup(frozen_url)[1] == b'f' * 1000
+    assert ingestion.cache_lookup(URL)[1] == bytes([4]) * 1000
+    assert blob_count(cache_dir) == 2
+
+
+def test_entry_evicted_during_lookup_is_a_miss(monkeypatch):
+    ingestion.cache_store(URL, b'<html>totals</html>')
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(ingestion.os, 'utime', evicted)
+    assert ingestion.cache_lookup(URL) == (None, None)
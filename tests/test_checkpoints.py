@@ -0,0 +1,33 @@
+import asyncio
+
+import nba_api_ingestion as ingestion
+
+
+def test_checkpoint_statements_bind_for_psycopg2():
+    executed = []
+
+    class Cursor:
+        def execute(self, statement, params=None):
+            executed.append((statement, params))
+
+    checkpoint = [ingestion.season_loaded_statement('player_season_totals', '2023-24', 572)]
+    ingestion._execute_checkpoint(Cursor(), checkpoint)
+
+    statement, params = executed[0]
+    assert 'VALUES (%(table_name)s, %(season)s, %(row_count)s, CURRENT_TIMESTAMP)' in statement
+    assert params == {'table_name': 'player_season_totals', 'season': '2023-24', 'row_count': 572}
+
+
+def test_checkpoint_statements_bind_positionally_for_asyncpg():
+    executed = []
+
+    class Connection:
+        async def execute(self, statement, *args):
+            executed.append((statement, args))
+
+    checkpoint = [ingestion.season_result_statement(7, 2024, 'loaded', 572, 'ab' * 32, 1.5)]
+    asyncio.run(ingestion._async_execute_checkpoint(Connection(), checkpoint))
+
+    statement, args = executed[0]
+    assert 'VALUES ($1, $2, $3, $4, $5, $6, $7, CURRENT_TIMESTAMP)' in statement
+    assert args == (7, 2024, 'loaded', 572, 'ab' * 32, 1500, None)
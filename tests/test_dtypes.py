@@ -0,0 +1,17 @@
+import nba_api_ingestion as ingestion
+
+
+def test_registered_columns_get_declared_dtypes(totals_page):
+    df = ingestion.parse_season_page(totals_page)
+
+    assert str(df['G'].dtype) == 'Int32'
+    assert str(df['FG%'].dtype) == 'float32'
+    assert str(df['Team'].dtype) == 'category'
+    # A registered text column stays text even when the whole season leaves it blank
+    assert df['Awards'].dtype == object
+
+
+def test_unregistered_columns_are_numeric_only_when_every_value_parses():
+    assert ingestion._column_to_series(['1', None, '3']).dtype.kind == 'f'
+    assert ingestion._column_to_series(['1', 'x']).dtype == object
+    assert ingestion._column_to_series([None, None], sniff=False).dtype == object
@@ -0,0 +1,22 @@
+import nba_api_ingestion as ingestion
+
+
+def test_commented_tables_are_extracted_from_the_same_parse(totals_page):
+    tables = ingestion.extract_tables(totals_page)
+
+    assert set(tables) == {'totals_stats', 'team_stats'}
+    teams = ingestion.stats_table_to_frame(tables['team_stats'])
+    assert teams['Team'].tolist() == ['Indiana Pacers', 'Boston Celtics']
+    # Team tables have no player links, so no PLAYER_ID column
+    assert 'PLAYER_ID' not in teams.columns
+
+
+def test_parse_stats_table_tries_candidate_ids_in_order(totals_page):
+    parsed = ingestion.parse_stats_table(totals_page, ('advanced_stats', 'team_stats'))
+
+    assert parsed['stats'] == ['ranker', 'team', 'pts']
+    assert ingestion.parse_stats_table(totals_page, 'per_game_stats') is None
+
+
+def test_missing_table_gives_an_empty_frame(totals_page):
+    assert ingestion.parse_season_page(totals_page, 'per_game').empty
@@ -0,0 +1,15 @@
+import nba_api_ingestion as ingestion
+
+
+def test_index_names_keep_the_legacy_prefix_only_on_the_default_table():
+    default = ingestion.secondary_index_ddl(ingestion.TOTALS_SCHEMA)
+    custom = ingestion.secondary_index_ddl(ingestion.TOTALS_SCHEMA, 'totals_copy')
+
+    assert default[0] == 'CREATE INDEX IF NOT EXISTS idx_player_id ON nba.player_season_totals(player_id)'
+    assert custom[0] == 'CREATE INDEX IF NOT EXISTS idx_totals_copy_player_id ON nba.totals_copy(player_id)'
+
+
+def test_concurrent_index_ddl():
+    statements = ingestion.secondary_index_ddl(ingestion.ADVANCED_SCHEMA, concurrently=True)
+
+    assert all(statement.startswith('CREATE INDEX CONCURRENTLY IF NOT EXISTS') for statement in statements)
@@ -0,0 +1,26 @@
+import pandas as pd
+
+import nba_api_ingestion as ingestion
+
+
+def test_normalize_columns_renames_to_table_columns(totals_page):
+    df = ingestion.parse_season_page(totals_page)
+    unmapped = ingestion.normalize_columns(df)
+
+    assert list(df.columns) == ['player_id', 'player', 'age', 'team', 'pos', 'g', 'fg_pct', 'pts', 'awards']
+    assert unmapped == ()
+
+
+def test_unknown_headers_get_the_generic_cleanup_and_are_reported():
+    df = pd.DataFrame(columns=['PTS', 'Mystery 3P%'])
+
+    assert ingestion.normalize_columns(df) == ('Mystery 3P%',)
+    assert list(df.columns) == ['pts', 'mystery three_p_pct']
+
+
+def test_mapping_is_computed_once_per_header_signature():
+    ingestion._column_mapping.cache_clear()
+    for _ in range(3):
+        ingestion.normalize_columns(pd.DataFrame(columns=['Player', 'PTS']))
+
+    assert ingestion._column_mapping.cache_info().misses == 1
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+import nba_api_ingestion as ingestion
+
+
+def test_repeated_header_rows_are_skipped(totals_page):
+    df = ingestion.parse_season_page(totals_page)
+
+    assert 'Player' not in df['Player'].tolist()
+    assert len(df) == 4
+
+
+def test_last_header_row_names_the_columns(totals_page):
+    df = ingestion.parse_season_page(totals_page)
+
+    assert list(df.columns) == ['PLAYER_ID', 'Player', 'Age', 'Team', 'Pos', 'G', 'FG%', 'PTS', 'Awards']
+
+
+def test_league_average_row_is_dropped_without_an_issue(totals_page):
+    df = ingestion.parse_season_page(totals_page)
+
+    assert 'League Average' not in df['Player'].tolist()
+    assert all(label != 'League Average' for _, _, label in df.attrs['row_issues'])
+
+
+def test_player_id_comes_from_each_rows_own_link(totals_page):
+    df = ingestion.parse_season_page(totals_page).set_index('Player')
+
+    assert df.loc['LeBron James', 'PLAYER_ID'] == 'jamesle01'
+    assert df.loc['James Harden', 'PLAYER_ID'] == 'hardeja01'
+    assert df.loc['Kevin Durant', 'PLAYER_ID'] == 'duranke01'
+
+
+def test_row_without_player_link_is_kept_and_reported(totals_page):
+    df = ingestion.parse_season_page(totals_page).set_index('Player')
+
+    assert pd.isna(df.loc['Mystery Rookie', 'PLAYER_ID'])
+    # The rows after it keep their own ids instead of shifting up
+    assert df.loc['Kevin Durant', 'PLAYER_ID'] == 'duranke01'
+    assert (3, 'missing player link', 'Mystery Rookie') in df.attrs['row_issues']
+
+
+def test_missing_cell_leaves_a_gap_instead_of_shifting(totals_page):
+    df = ingestion.parse_season_page(totals_page).set_index('Player')
+
+    assert pd.isna(df.loc['James Harden', 'Pos'])
+    assert df.loc['James Harden', 'G'] == 72
+    assert df.loc['James Harden', 'PTS'] == 1215
+    assert (2, 'missing cells: pos', 'James Harden') in df.attrs['row_issues']
+
+
+def test_strict_rows_raises_on_the_first_unaligned_row(totals_page):
+    with pytest.raises(ingestion.RowAlignmentError, match="James Harden"):
+        ingestion.parse_season_page(totals_page, strict_rows=True)
+
+
+def test_row_missing_its_player_cell_is_skipped():
+    html = (
+        b'<table id="totals_stats"><thead><tr><th data-stat="player">Player</th><th data-stat="pts">PTS</th></tr></thead>'
+        b'<tbody><tr><td data-stat="pts">10</td></tr>'
+        b'<tr><td data-stat="player"><a href="/players/a/aaa01.html">A</a></td><td data-stat="pts">20</td></tr>'
+        b'</tbody></table>'
+    )
+    parsed = ingestion.parse_stats_table(html, 'totals_stats')
+
+    assert parsed['columns']['pts'] == ['20']
+    assert parsed['player_ids'] == ['aaa01']
+    assert parsed['row_issues'] == [(0, 'missing player cell', None)]
@@ -0,0 +1,13 @@
+import nba_api_ingestion as ingestion
+
+
+def test_partitioned_ddl_keys_on_season_and_skips_the_season_index():
+    ddl = ingestion.build_table_ddl(ingestion.PER_GAME_SCHEMA, partitioned=True)
+
+    assert 'PRIMARY KEY (id, season)' in ddl
+    assert ') PARTITION BY LIST (season);' in ddl
+    assert '(season)' not in ddl.split('PARTITION BY LIST (season)', 1)[1]
+
+
+def test_partitions_are_named_after_the_season_end_year():
+    assert ingestion.partition_name('player_season_totals', 2024) == 'player_season_totals_2024'
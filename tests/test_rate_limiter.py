@@ -0,0 +1,84 @@
+import pytest
+
+import nba_api_ingestion as ingestion
+from conftest import http_error
+
+
+def test_retry_after_beyond_the_ceiling_halts_instead_of_waiting(monkeypatch):
+    monkeypatch.setitem(ingestion.SCRAPER_CONFIG, 'max_retry_after', 300)
+    error = http_error(429, {'Retry-After': '3600'})
+
+    with pytest.raises(ingestion.RetryAfterExceeded):
+        ingestion._retry_delay(error, 1, 'fetch', ingestion.RetryBudget(10), {})
+
+
+def test_parse_retry_after():
+    assert ingestion.parse_retry_after('120') == 120
+    assert ingestion.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert ingestion.parse_retry_after('soon') is None
+    assert ingestion.parse_retry_after(None) is None
+
+
+def limiter(**kwargs):
+    options = dict(min_rate=0.1, max_rate=2.0, increase=0.1, decrease=0.5, latency_target=2.0)
+    options.update(kwargs)
+    return ingestion.AdaptiveRateLimiter(1.0, **options)
+
+
+def test_healthy_responses_raise_the_rate_additively_up_to_the_maximum():
+    rate_limiter = limiter()
+    rate_limiter.record_success(0.1)
+    assert rate_limiter.rate == pytest.approx(1.1)
+
+    for _ in range(20):
+        rate_limiter.record_success(0.1)
+    assert rate_limiter.rate == 2.0
+
+
+def test_throttling_cuts_the_rate_once_per_round():
+    rate_limiter = limiter()
+    rate_limiter.record_throttle()
+    # Responses already in flight report the same overload
+    rate_limiter.record_throttle()
+    assert rate_limiter.rate == pytest.approx(0.5)
+
+
+def test_slow_responses_back_off_gently():
+    rate_limiter = limiter()
+    rate_limiter.record_success(5.0)
+    assert rate_limiter.rate == pytest.approx(0.75)
+
+
+def test_rate_never_drops_below_the_minimum():
+    rate_limiter = limiter(min_rate=0.8)
+    rate_limiter.record_throttle()
+    assert rate_limiter.rate == 0.8
+
+
+def test_pause_longer_than_max_pause_raises_instead_of_waiting():
+    rate_limiter = limiter(max_pause=300)
+    rate_limiter.record_throttle(retry_after=3600)
+
+    with pytest.raises(ingestion.RetryAfterExceeded):
+        rate_limiter.acquire()
+
+
+def test_pending_pause_carries_over_to_the_next_run(tmp_path):
+    state_file = str(tmp_path / 'rate_limit.json')
+    rate_limiter = limiter(max_pause=300, state_file=state_file)
+    rate_limiter.record_throttle(retry_after=3600)
+    rate_limiter.save_state()
+
+    next_run = limiter(max_pause=300, state_file=state_file)
+    assert next_run.rate == pytest.approx(0.5)
+    with pytest.raises(ingestion.RetryAfterExceeded):
+        next_run.acquire()
+
+
+def test_saved_rate_is_clamped_to_the_current_bounds(tmp_path):
+    state_file = str(tmp_path / 'rate_limit.json')
+    fast = limiter(max_rate=2.0, state_file=state_file)
+    fast.rate = 2.0
+    fast.save_state()
+
+    assert limiter(max_rate=1.0, state_file=state_file).rate == 1.0
@@ -0,0 +1,56 @@
+import pytest
+import requests
+
+import nba_api_ingestion as ingestion
+from conftest import http_error
+
+
+@pytest.mark.parametrize('error, stage, kind', [
+    (http_error(429), 'fetch', 'throttled'),
+    (http_error(503), 'fetch', 'server'),
+    (http_error(404), 'fetch', 'client'),
+    (requests.exceptions.ReadTimeout(), 'fetch', 'timeout'),
+    (requests.exceptions.ConnectionError(), 'fetch', 'connection'),
+    (ingestion.RowAlignmentError('bad row'), 'parse', 'parse'),
+    (ConnectionResetError(), 'load', 'db_connection'),
+    (ValueError('bad value'), 'load', 'db'),
+    (ingestion.RetryAfterExceeded(3600), 'fetch', 'halted'),
+    (ingestion.IngestionError('boom', 'server'), None, 'server'),
+])
+def test_classify_error(error, stage, kind):
+    assert ingestion.classify_error(error, stage) == kind
+
+
+def test_only_transient_kinds_are_retried():
+    assert {'throttled', 'server', 'timeout', 'connection', 'db_connection'} <= ingestion.TRANSIENT_ERROR_KINDS
+    assert not {'client', 'parse', 'db', 'halted', 'other'} & ingestion.TRANSIENT_ERROR_KINDS
+
+
+def test_backoff_stays_under_the_exponential_ceiling(monkeypatch):
+    monkeypatch.setitem(ingestion.RETRY_CONFIG, 'base_delay', 1)
+    monkeypatch.setitem(ingestion.RETRY_CONFIG, 'max_delay', 5)
+
+    for attempt in range(1, 6):
+        assert 0 <= ingestion.backoff_delay(attempt) <= min(5, 2 ** attempt)
+
+
+def test_backoff_honors_the_full_retry_after():
+    assert ingestion.backoff_delay(1, retry_after=3600) >= 3600
+
+
+def test_retry_delay_spends_the_budget_and_counts_retries():
+    budget = ingestion.RetryBudget(1)
+    job = {}
+
+    assert ingestion._retry_delay(http_error(503), 1, 'fetch', budget, job) is not None
+    assert job['retries'] == 1
+    # Budget exhausted
+    assert ingestion._retry_delay(http_error(503), 1, 'fetch', budget, job) is None
+
+
+def test_retry_delay_gives_up_on_permanent_errors_and_the_last_attempt():
+    budget = ingestion.RetryBudget(10)
+
+    assert ingestion._retry_delay(http_error(404), 1, 'fetch', budget, {}) is None
+    attempts = ingestion.RETRY_CONFIG['max_attempts']
+    assert ingestion._retry_delay(http_error(503), attempts, 'fetch', budget, {}) is None
@@ -0,0 +1,20 @@
+import pandas as pd
+
+import nba_api_ingestion as ingestion
+
+
+def test_split_columns_orders_by_table_and_reports_extras():
+    df = pd.DataFrame(columns=['pts', 'player_id', 'mystery', 'team'])
+
+    columns, skipped = ingestion.TOTALS_SCHEMA.split_columns(df)
+    assert columns == ['player_id', 'team', 'pts']
+    assert skipped == ['mystery']
+
+
+def test_ddl_creates_every_registered_column():
+    ddl = ingestion.build_table_ddl(ingestion.TOTALS_SCHEMA)
+
+    assert ddl.startswith('CREATE TABLE IF NOT EXISTS nba.player_season_totals (')
+    assert 'id SERIAL PRIMARY KEY' in ddl
+    for spec in ingestion.TOTALS_SCHEMA.columns:
+        assert f"ADD COLUMN IF NOT EXISTS {spec.name} {spec.sql_type};" in ddl
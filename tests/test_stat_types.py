@@ -0,0 +1,24 @@
+import nba_api_ingestion as ingestion
+
+
+def test_every_stat_type_records_where_its_pages_begin():
+    assert ingestion.SCHEMAS['totals'].first_season == 1950
+    assert ingestion.SCHEMAS['shooting'].first_season == 1997
+    assert all(1950 <= table_schema.first_season <= 2000 for table_schema in ingestion.SCHEMAS.values())
+
+
+def test_seasons_before_a_stat_types_first_page_are_not_fetched(monkeypatch, totals_page):
+    fetched = []
+
+    def fetch_season_page(season_end_year, stat_type='totals'):
+        fetched.append((season_end_year, stat_type))
+        return totals_page
+
+    monkeypatch.setattr(ingestion, 'fetch_season_page', fetch_season_page)
+    monkeypatch.setattr(ingestion, 'aiohttp', None)
+    monkeypatch.setattr(ingestion, 'RATE_LIMITER', ingestion.AdaptiveRateLimiter(1000, 10, max_rate=1000))
+
+    ingestion.get_all_seasons(1995, 1998, save_to_db=False, stat_types=('totals', 'shooting'))
+
+    assert sorted(year for year, stat_type in fetched if stat_type == 'totals') == [1995, 1996, 1997, 1998]
+    assert sorted(year for year, stat_type in fetched if stat_type == 'shooting') == [1997, 1998]
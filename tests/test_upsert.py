@@ -0,0 +1,42 @@
+import pandas as pd
+
+import nba_api_ingestion as ingestion
+
+
+def test_rows_missing_a_natural_key_value_are_left_out_of_upserts():
+    df = pd.DataFrame({
+        'player_id': ['jamesle01', None, 'duranke01'],
+        'season': ['2023-24'] * 3,
+        'team': ['LAL', 'BOS', None],
+        'pts': [1822, 10, 1963],
+    })
+
+    keyed, dropped = ingestion.drop_null_keys(df)
+    assert keyed['player_id'].tolist() == ['jamesle01']
+    assert dropped == 2
+
+
+def test_fully_keyed_frames_pass_through():
+    df = pd.DataFrame({'player_id': ['jamesle01'], 'season': ['2023-24'], 'team': ['LAL']})
+
+    keyed, dropped = ingestion.drop_null_keys(df)
+    assert keyed.equals(df)
+    assert dropped == 0
+
+
+def test_merge_only_rewrites_rows_whose_values_changed():
+    sql = ingestion._merge_sql(ingestion.TOTALS_SCHEMA, ['player_id', 'season', 'team', 'pts', 'g'],
+                               'nba.t', 't_stage')
+
+    assert sql == (
+        "INSERT INTO nba.t AS target (player_id, season, team, pts, g) "
+        "SELECT player_id, season, team, pts, g FROM t_stage "
+        "ON CONFLICT (player_id, season, team) DO UPDATE SET pts = EXCLUDED.pts, g = EXCLUDED.g "
+        "WHERE (target.pts, target.g) IS DISTINCT FROM (EXCLUDED.pts, EXCLUDED.g)"
+    )
+
+
+def test_merge_of_key_columns_only_does_nothing_on_conflict():
+    sql = ingestion._merge_sql(ingestion.TOTALS_SCHEMA, ['player_id', 'season', 'team'], 'nba.t', 't_stage')
+
+    assert sql.endswith('ON CONFLICT (player_id, season, team) DO NOTHING')